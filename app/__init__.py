@@ -12,22 +12,97 @@ Revisions:
 
 
 import json
+import os
 from flask import Flask
+from app.admin import admin
+from app.api import api
+from app.compression import init_compression
 from app.extensions import db
+from app.jobs import init_jobs
 from app.models import Employee
+from app.profiling import init_profiling
 from app.routes import pages
+from app.sharding import init_sharding, shard_binds
+from app.static_assets import init_static_assets
 
-def create_app(database_uri='sqlite:///app.db'):
+def create_app(database_uri='sqlite:///app.db', shard_uris=None):
     app = Flask(__name__)
 
     # Sets config for development
     app.config['SECRET_KEY'] = 'employee_directory_secret_key'
     app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    # Listing page sizes: default, largest allowed, and the size
+    # from which pages are streamed
+    app.config['ROWS_PER_PAGE'] = 3
+    app.config['MAX_PAGE_SIZE'] = 5000
+    app.config['STREAM_PAGE_SIZE'] = 200
+    # Change feed long-poll and server-sent event limits (seconds)
+    app.config['CHANGES_MAX_WAIT'] = 30
+    app.config['CHANGE_STREAM_TIMEOUT'] = 300
+    app.config['CHANGE_STREAM_KEEPALIVE'] = 15
+    # In-process directory snapshot for lookups and listings
+    app.config['DIRECTORY_SNAPSHOT'] = False
+    app.config['DIRECTORY_REFRESH_INTERVAL'] = 1.0
+    # Largest JSON array accepted by the bulk employee endpoint
+    app.config['BULK_MAX_ROWS'] = 10000
+    # Response compression and fingerprinted static file caching
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_LEVEL'] = 6
+    app.config['COMPRESS_BR_QUALITY'] = 5
+    app.config['STATIC_MAX_AGE'] = 31536000
+    # Write admission control per endpoint; WRITE_LIMITS entries
+    # (keyed by endpoint, e.g. 'pages.add_emp') override the default
+    app.config['WRITE_LIMIT_DEFAULT'] = {'concurrency': 2, 'queue': 16,
+                                         'timeout': 5.0, 'retry_after': 1}
+    app.config['WRITE_LIMITS'] = {'api.employees_bulk': {'concurrency': 1, 'queue': 2,
+                                                         'retry_after': 5}}
+    # Optional department sharding: shard_uris maps each department to
+    # the database holding its employees (departments may share one);
+    # without it the SHARD_URIS environment variable (JSON) is used.
+    # Shard changes not copied to the main log within SHARD_SYNC_AFTER
+    # seconds are copied by the job runner
+    app.config['SHARD_URIS'] = app.config['DEPARTMENT_SHARDS'] = None
+    app.config['SHARD_SYNC_AFTER'] = 60.0
+    if shard_uris is None and os.environ.get('SHARD_URIS'):
+        shard_uris = json.loads(os.environ['SHARD_URIS'])
+    if shard_uris:
+        app.config['SHARD_URIS'], app.config['DEPARTMENT_SHARDS'] = shard_binds(shard_uris)
+    # Admin endpoints are disabled until a token is set
+    app.config['ADMIN_TOKEN'] = None
+    # Background import/export jobs: start the in-process runner with
+    # the first request, worker threads, queue poll and progress write
+    # intervals (seconds), seconds without a heartbeat after which a
+    # running job counts as orphaned, export output folder (None for
+    # instance/exports)
+    app.config['JOB_AUTOSTART'] = True
+    app.config['JOB_CONCURRENCY'] = 1
+    app.config['JOB_POLL_INTERVAL'] = 5.0
+    app.config['JOB_STALE_AFTER'] = 60.0
+    app.config['JOB_PROGRESS_INTERVAL'] = 1.0
+    app.config['JOB_EXPORT_FOLDER'] = None
+    # Request profiling: share of requests profiled at random (admins
+    # can also send X-Profile), sampling interval (seconds), profiles
+    # kept and SQL statements recorded per profile
+    app.config['PROFILE_SAMPLE_RATE'] = 0.0
+    app.config['PROFILE_INTERVAL'] = 0.005
+    app.config['PROFILE_KEEP'] = 50
+    app.config['PROFILE_MAX_QUERIES'] = 500
+    # Online migrations: backfill rows per batch and pause between
+    # batches (seconds) so request writes get the database in between
+    app.config['MIGRATION_BATCH_SIZE'] = 1000
+    app.config['MIGRATION_PAUSE'] = 0.05
 
     # Initialize extensions
     db.init_app(app)
+    init_compression(app)
+    init_static_assets(app)
+    init_sharding(app)
+    init_profiling(app)
+    init_jobs(app)
  
     # Register blueprints
     app.register_blueprint(pages)
+    app.register_blueprint(api)
+    app.register_blueprint(admin)
 
     return app
\ No newline at end of file
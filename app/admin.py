@@ -0,0 +1,134 @@
+"""
+Program: Admin
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Admin endpoints for background jobs and request
+             profiles. Every request must carry the configured
+             ADMIN_TOKEN in the X-Admin-Token header; with no token
+             configured the endpoints are disabled.
+
+
+Revisions:
+
+"""
+
+
+import hmac
+import io
+import os
+import zipfile
+from flask import (abort,
+                   Blueprint,
+                   current_app,
+                   jsonify,
+                   request,
+                   Response,
+                   send_file,
+                   url_for)
+import sqlalchemy as sa
+from app.admission import limit_writes
+from app.extensions import db
+from app.jobs import (cancel_job,
+                      job_status,
+                      submit_job,
+                      SUCCEEDED)
+from app.models import Job
+
+ADMIN_HEADER = 'X-Admin-Token'
+
+
+admin = Blueprint('admin', __name__, url_prefix='/admin')
+
+def is_admin_request() -> bool:
+    token = current_app.config.get('ADMIN_TOKEN')
+    sent = request.headers.get(ADMIN_HEADER)
+    return bool(token) and sent is not None and hmac.compare_digest(sent, token)
+
+@admin.before_request
+def require_admin():
+    if not is_admin_request():
+        abort(403)
+
+def get_job_or_404(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        abort(404)
+    return job
+
+@admin.route('/jobs/')
+def jobs():
+    limit = max(min(request.args.get('limit', default=50, type=int), 500), 1)
+    query = sa.select(Job).order_by(Job.id.desc()).limit(limit)
+    return jsonify(jobs=[job_status(job) for job in db.session.scalars(query)])
+
+@admin.route('/jobs/', methods=['POST'])
+@limit_writes
+def jobs_submit():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not isinstance(body.get('params', {}), dict):
+        abort(400)
+    # Output paths are for manage_db.py only; exports submitted here
+    # are written to (and downloaded from) JOB_EXPORT_FOLDER
+    if 'output' in body.get('params', {}):
+        return jsonify(error='output cannot be set over HTTP'), 400
+    try:
+        job = submit_job(body.get('kind'), body.get('params', {}))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(job_status(job)), 202, {'Location': url_for('admin.job', job_id=job.id)}
+
+@admin.route('/jobs/<int:job_id>/')
+def job(job_id):
+    return jsonify(job_status(get_job_or_404(job_id)))
+
+@admin.route('/jobs/<int:job_id>/cancel/', methods=['POST'])
+def job_cancel(job_id):
+    return jsonify(job_status(cancel_job(get_job_or_404(job_id)))), 202
+
+@admin.route('/jobs/<int:job_id>/download/')
+def job_download(job_id):
+    job = get_job_or_404(job_id)
+    if job.kind != 'export' or job.status != SUCCEEDED:
+        abort(409)
+    path = job.result['path']
+    if not os.path.exists(path):
+        abort(410)
+    return send_file(path, as_attachment=True)
+
+def get_profile_or_404(profile_id):
+    profile = current_app.extensions['profile_store'].get(profile_id)
+    if profile is None:
+        abort(404)
+    return profile
+
+@admin.route('/profiles/')
+def profiles():
+    limit = max(request.args.get('limit', default=20, type=int), 1)
+    store = current_app.extensions['profile_store']
+    return jsonify(profiles=[profile.summary() for profile in store.slowest(limit)])
+
+@admin.route('/profiles/<int:profile_id>/')
+def profile(profile_id):
+    profile = get_profile_or_404(profile_id)
+    return jsonify(profile.summary() | {'sql': profile.queries})
+
+@admin.route('/profiles/<int:profile_id>/flamegraph/')
+def profile_flamegraph(profile_id):
+    """
+        Description: Collapsed stacks for flamegraph.pl or speedscope;
+                    ?format=zip bundles them with the request's SQL.
+        Param: profile_id - profile id (X-Profile-Id response header)
+        Return: Folded stacks text or zip attachment
+    """
+    profile = get_profile_or_404(profile_id)
+    name = f'profile-{profile.id}'
+    if request.args.get('format') == 'zip':
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(f'{name}.folded', profile.folded())
+            archive.writestr(f'{name}.sql', profile.sql_text())
+        return Response(buffer.getvalue(), mimetype='application/zip',
+                        headers={'Content-Disposition': f'attachment; filename={name}.zip'})
+    return Response(profile.folded(), mimetype='text/plain',
+                    headers={'Content-Disposition': f'attachment; filename={name}.folded'})
@@ -0,0 +1,133 @@
+"""
+Program: Admission
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Admission control for write endpoints. Each endpoint
+             gets a concurrency limit with a bounded wait queue; when
+             the queue is full (or the wait times out) the request fails
+             fast with 503 and Retry-After instead of piling onto
+             SQLite's single writer lock.
+
+
+Revisions:
+
+"""
+
+
+import threading
+import time
+from functools import wraps
+from flask import abort, current_app, request, Response
+
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class WriteLimiter:
+    """
+        Description: Counting limiter with a bounded queue. acquire()
+                    returns False instead of waiting when the queue is
+                    full, or once the queue timeout runs out.
+    """
+
+    def __init__(self, concurrency:int, queue:int, timeout:float) -> None:
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        with self._cond:
+            if self.active < self.concurrency and not self.waiting:
+                self.active += 1
+                self.admitted += 1
+                return True
+            if self.waiting >= self.queue:
+                self.rejected += 1
+                return False
+
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            deadline = time.monotonic() + self.timeout
+            try:
+                while self.active >= self.concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        self.timed_out += 1
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.admitted += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        return {'concurrency': self.concurrency, 'queue': self.queue,
+                'active': self.active, 'waiting': self.waiting,
+                'peak_waiting': self.peak_waiting, 'admitted': self.admitted,
+                'rejected': self.rejected, 'timed_out': self.timed_out}
+
+
+_limiters_lock = threading.Lock()
+
+def endpoint_limits(endpoint:str) -> dict:
+    """
+        Description: Limits for an endpoint: WRITE_LIMIT_DEFAULT updated
+                    with any WRITE_LIMITS entry for the endpoint.
+        Param: endpoint - Flask endpoint name (e.g. 'pages.add_emp')
+        Return: Dict with concurrency, queue, timeout and retry_after
+    """
+    limits = dict(current_app.config['WRITE_LIMIT_DEFAULT'])
+    limits.update(current_app.config['WRITE_LIMITS'].get(endpoint, {}))
+    return limits
+
+def get_limiter(endpoint:str) -> WriteLimiter:
+    limiters = current_app.extensions.setdefault('write_limiters', {})
+    limiter = limiters.get(endpoint)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = limiters.get(endpoint)
+            if limiter is None:
+                limits = endpoint_limits(endpoint)
+                limiter = limiters[endpoint] = WriteLimiter(
+                    limits['concurrency'], limits['queue'], limits['timeout'])
+    return limiter
+
+def limiter_stats() -> dict:
+    limiters = current_app.extensions.get('write_limiters', {})
+    return {endpoint: limiter.stats() for endpoint, limiter in sorted(limiters.items())}
+
+def limit_writes(view):
+    """
+        Description: Decorator applying the endpoint's write limiter to
+                    non-GET requests.
+        Param: view - view function
+        Return: Wrapped view function
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(*args, **kwargs)
+        limiter = get_limiter(request.endpoint)
+        if not limiter.acquire():
+            retry_after = endpoint_limits(request.endpoint)['retry_after']
+            abort(Response('Too many concurrent updates, please retry shortly.',
+                           503, {'Retry-After': str(retry_after)}))
+        try:
+            return view(*args, **kwargs)
+        finally:
+            limiter.release()
+    return wrapper
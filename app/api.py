@@ -0,0 +1,160 @@
+"""
+Program: API
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: JSON endpoints for downstream systems
+
+
+Revisions:
+
+"""
+
+
+import json
+import time
+from flask import (abort,
+                   Blueprint,
+                   current_app,
+                   jsonify,
+                   request,
+                   Response,
+                   stream_with_context)
+import sqlalchemy as sa
+from app.admission import limit_writes, limiter_stats
+from app.changes import (change_data,
+                         changes_since,
+                         insert_employees,
+                         wait_for_changes)
+from app.directory import get_directory
+from app.emails import allocate_emails
+from app.extensions import db
+from app.models import Employee
+from app import sharding
+from app.validation import EMPLOYEE_FIELDS, validate_records
+
+
+api = Blueprint('api', __name__, url_prefix='/api')
+
+@api.route('/changes/')
+def changes():
+    since = request.args.get('since', default=0, type=int)
+    limit = max(min(request.args.get('limit', default=500, type=int), 5000), 1)
+    wait = min(request.args.get('wait', default=0, type=float),
+               current_app.config['CHANGES_MAX_WAIT'])
+
+    if wait > 0:
+        found = wait_for_changes(since, wait, limit)
+    else:
+        found = changes_since(since, limit)
+
+    last_seq = found[-1]['seq'] if found else since
+    return jsonify(changes=found, last_seq=last_seq)
+
+@api.route('/changes/stream/')
+def changes_stream():
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', default=0, type=int)
+    timeout = current_app.config['CHANGE_STREAM_TIMEOUT']
+    keepalive = current_app.config['CHANGE_STREAM_KEEPALIVE']
+
+    def events(seq):
+        # Ends after the timeout; EventSource reconnects with Last-Event-ID
+        deadline = time.monotonic() + timeout
+        yield 'retry: 1000\n\n'
+        while time.monotonic() < deadline:
+            found = wait_for_changes(seq, min(keepalive, deadline - time.monotonic()))
+            if not found:
+                yield ': keepalive\n\n'
+                continue
+            for change in found:
+                yield f"id: {change['seq']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+            seq = found[-1]['seq']
+
+    return Response(stream_with_context(events(since)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+@api.route('/employees/<int:emp_id>/')
+def employee(emp_id):
+    directory = get_directory()
+    if directory is not None:
+        record = directory.get(emp_id)
+        if record is None:
+            abort(404)
+        return jsonify(record.as_dict())
+
+    if sharding.sharding_enabled():
+        emp = sharding.get_employee(emp_id)
+    else:
+        emp = db.session.get(Employee, emp_id)
+    if emp is None:
+        abort(404)
+    return jsonify(change_data(emp))
+
+@api.route('/employees/')
+def employee_lookup():
+    email = request.args.get('email')
+    ext = request.args.get('ext')
+    if not email and not ext:
+        abort(400)
+
+    directory = get_directory()
+    if directory is not None:
+        if email:
+            record = directory.by_email(email)
+            records = [record] if record and (not ext or record.ext == ext) else []
+        else:
+            records = directory.by_ext(ext)
+        return jsonify(employees=[record.as_dict() for record in records])
+
+    query = sa.select(Employee).order_by(Employee.id)
+    if email:
+        query = query.where(Employee.email == email)
+    if ext:
+        query = query.where(Employee.ext == ext)
+    if sharding.sharding_enabled():
+        emps = sorted((emp for result in sharding.fan_out(query) for emp in result.scalars()),
+                      key=lambda emp: emp.id)
+    else:
+        emps = db.session.scalars(query)
+    return jsonify(employees=[change_data(emp) for emp in emps])
+
+@api.route('/employees/bulk/', methods=['POST'])
+@limit_writes
+def employees_bulk():
+    records = request.get_json(silent=True)
+    if not isinstance(records, list):
+        abort(400)
+    if len(records) > current_app.config['BULK_MAX_ROWS']:
+        abort(413)
+
+    rows, errors = validate_records(records)
+    values = [dict(zip(EMPLOYEE_FIELDS, row))
+              for position, row in enumerate(rows) if position not in errors]
+
+    try:
+        emails = allocate_emails([(emp['fname'], emp['lname']) for emp in values])
+        for emp, email in zip(values, emails):
+            emp['email'] = email
+        created = insert_employees(values) if values else []
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=f'Database error: {e}'), 409
+
+    return jsonify(created=[dict(row) for row in created],
+                   errors=[{'row': position, 'errors': errors[position]}
+                           for position in sorted(errors)])
+
+@api.route('/directory/')
+def directory_stats():
+    directory = get_directory()
+    if directory is None:
+        return jsonify(enabled=False)
+    return jsonify(directory.stats())
+
+@api.route('/metrics/')
+def metrics():
+    return jsonify(write_limiters=limiter_stats())
@@ -0,0 +1,140 @@
+"""
+Program: Changes
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Append-only change log of employee mutations. Changes
+             are added to the caller's session so they commit in the
+             same transaction as the employee rows (with sharding on,
+             to the shard's log first; see sharding). The highest seq is
+             the change generation counter consumers sync from.
+
+
+Revisions:
+
+"""
+
+
+import time
+import sqlalchemy as sa
+from app.extensions import db
+from app.models import Employee, EmployeeChange
+from app import sharding
+
+CHANGE_FIELDS = ('id', 'fname', 'lname', 'dept', 'ext', 'email')
+OP_INSERT = 'insert'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+
+
+def change_data(emp) -> dict:
+    """
+        Description: Builds the change payload for an employee.
+        Param: emp - Employee instance or row mapping
+        Return: Dict of employee fields
+    """
+    if isinstance(emp, Employee):
+        return {field: getattr(emp, field) for field in CHANGE_FIELDS}
+    return {field: emp[field] for field in CHANGE_FIELDS}
+
+def record_change(op:str, emp:Employee) -> None:
+    """
+        Description: Adds a change for one employee to the current
+                    session. New employees are flushed first so the
+                    change carries their id.
+        Param: op - OP_INSERT, OP_UPDATE or OP_DELETE
+        Param: emp - Employee being changed
+        Return: None
+    """
+    if sharding.sharding_enabled():
+        sharding.log_changes(sharding.shard_for(emp.dept),
+                             [{'emp_id': emp.id, 'op': op, 'data': change_data(emp)}])
+        return
+    if emp.id is None:
+        db.session.flush()
+    db.session.add(EmployeeChange(emp_id=emp.id, op=op, data=change_data(emp)))
+
+def record_changes(op:str, rows:list) -> None:
+    """
+        Description: Adds changes for many employees with one
+                    executemany, for the bulk import paths.
+        Param: op - OP_INSERT, OP_UPDATE or OP_DELETE
+        Param: rows - row mappings including the employee id
+        Return: None
+    """
+    if not rows:
+        return
+    values = [{'emp_id': row['id'], 'op': op, 'data': change_data(row)} for row in rows]
+    if not sharding.sharding_enabled():
+        db.session.execute(sa.insert(EmployeeChange), values)
+        return
+    by_shard = {}
+    for row, value in zip(rows, values):
+        by_shard.setdefault(sharding.shard_for(row['dept']), []).append(value)
+    for key, shard_values in by_shard.items():
+        sharding.log_changes(key, shard_values)
+
+def insert_employees(values:list) -> list:
+    """
+        Description: Bulk inserts employees with one executemany and
+                    logs them in the same transaction.
+        Param: values - list of dicts of Employee fields
+        Return: Inserted rows (id and change fields) in input order
+    """
+    if sharding.sharding_enabled():
+        rows = sharding.insert_employees(values)
+    else:
+        result = db.session.execute(
+            sa.insert(Employee).returning(*[getattr(Employee, field) for field in CHANGE_FIELDS],
+                                          sort_by_parameter_order=True),
+            values)
+        rows = result.mappings().all()
+    record_changes(OP_INSERT, rows)
+    return rows
+
+def current_seq() -> int:
+    """
+        Description: Returns the change generation counter.
+        Return: Highest committed seq (0 when the log is empty)
+    """
+    return db.session.scalar(sa.select(sa.func.max(EmployeeChange.seq))) or 0
+
+def changes_since(seq:int, limit:int = 500) -> list:
+    """
+        Description: Reads changes after a sequence number. SQLite has a
+                    single writer, so seqs become visible in order and a
+                    consumer never skips a change by advancing to the
+                    last seq it saw.
+        Param: seq - last sequence number the consumer has applied
+        Param: limit - maximum changes returned
+        Return: List of change dicts in seq order
+    """
+    result = db.session.execute(
+        sa.select(EmployeeChange.seq, EmployeeChange.emp_id, EmployeeChange.op,
+                  EmployeeChange.data, EmployeeChange.created_at)
+        .where(EmployeeChange.seq > seq)
+        .order_by(EmployeeChange.seq)
+        .limit(limit))
+    return [{'seq': row.seq, 'emp_id': row.emp_id, 'op': row.op,
+             'data': row.data, 'created_at': row.created_at.isoformat()}
+            for row in result]
+
+def wait_for_changes(seq:int, timeout:float, limit:int = 500,
+                     poll_interval:float = 0.25) -> list:
+    """
+        Description: Long-poll variant of changes_since. Returns as soon
+                    as changes exist or the timeout runs out.
+        Param: seq - last sequence number the consumer has applied
+        Param: timeout - seconds to wait for new changes
+        Param: limit - maximum changes returned
+        Param: poll_interval - seconds between checks
+        Return: List of change dicts (empty on timeout)
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        changes = changes_since(seq, limit)
+        if changes or time.monotonic() >= deadline:
+            return changes
+        # End the read so the next poll sees newly committed rows
+        db.session.close()
+        time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
@@ -0,0 +1,115 @@
+"""
+Program: Compression
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Compresses HTML and JSON responses above a size threshold.
+             Brotli is used when the brotli package is installed and
+             the client accepts it, otherwise gzip. Streamed HTML (large
+             listing pages) is compressed incrementally, flushing after
+             every chunk so the browser can render rows as they arrive.
+
+
+Revisions:
+
+"""
+
+
+import gzip
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIMETYPES = {'text/html', 'application/json'}
+STREAM_MIMETYPES = {'text/html'}
+
+
+def choose_encoding(accept_encodings) -> str | None:
+    """
+        Description: Picks the best supported encoding the client accepts.
+        Param: accept_encodings - request.accept_encodings
+        Return: 'br', 'gzip' or None
+    """
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compress_stream(chunks, encoding:str, charset:str = 'utf-8'):
+    """
+        Description: Compresses a streamed body chunk by chunk, with a
+                    sync flush after each one so no chunk is held back.
+        Param: chunks - iterable of str or bytes
+        Param: encoding - 'br' or 'gzip'
+        Param: charset - encoding of str chunks
+        Return: Generator of compressed bytes
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=current_app.config['COMPRESS_BR_QUALITY'])
+        compress, flush = compressor.process, compressor.flush
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(current_app.config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+        compress = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def compress_response(response):
+    """
+        Description: after_request hook compressing eligible responses.
+                    Streamed HTML is compressed as it is sent; other
+                    streamed and passthrough (file) responses are left
+                    alone.
+        Param: response - outgoing response
+        Return: Response
+    """
+    if (response.mimetype not in COMPRESS_MIMETYPES
+            or response.status_code < 200 or response.status_code >= 300
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    if response.is_streamed:
+        if response.mimetype not in STREAM_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        response.response = compress_stream(response.response, encoding)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=current_app.config['COMPRESS_BR_QUALITY']))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL']))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def init_compression(app) -> None:
+    app.after_request(compress_response)
@@ -0,0 +1,221 @@
+"""
+Program: CSV Reader
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Memory-mapped CSV reader used by the import paths.
+             Records are located directly in the mapped file and
+             returned as tuples in header order, so large files are
+             never buffered in full and no dict is built per row.
+
+
+Revisions:
+
+"""
+
+
+import csv
+import mmap
+import os
+from operator import itemgetter
+
+
+class MappedCSVReader:
+    """
+        Description: Reads a CSV file through a read-only memory map.
+                    Runs of records without the quote character are
+                    decoded and split into lines in bulk; only records
+                    containing it are scanned one at a time and go
+                    through the csv module. Iteration can start at any
+                    record boundary byte offset, which makes chunked and
+                    resumed reads possible.
+    """
+
+    def __init__(self, path:str, encoding:str = 'utf-8',
+                 delimiter:str = ',', quotechar:str = '"') -> None:
+        self.path = path
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.quotechar = quotechar
+        self._quote = quotechar.encode(encoding)
+        self._delimiter = delimiter.encode(encoding)
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses zero length files
+        self._map = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                     if self.size else b'')
+
+        end = self._record_end(0)
+        header = self._decode(0, end)
+        if header.startswith('\ufeff'):
+            header = header[1:]
+        self.header = self._split(header) if header else ()
+        self.data_offset = self._next_start(end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __iter__(self):
+        for _, _, rows in self.iter_chunks():
+            yield from rows
+
+    def close(self) -> None:
+        """
+            Description: Releases the memory map and file handle.
+            Return: None
+        """
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def getter(self, field_names:list):
+        """
+            Description: Builds a callable that projects a row tuple
+                        onto the given field names.
+            Param: field_names - header names to select, in order
+            Return: Callable returning a tuple of field values
+        """
+        missing = [name for name in field_names if name not in self.header]
+        if missing:
+            raise KeyError(f"Fields not in CSV header: {', '.join(missing)}")
+        indexes = [self.header.index(name) for name in field_names]
+        if len(indexes) == 1:
+            index = indexes[0]
+            return lambda row: (row[index],)
+        return itemgetter(*indexes)
+
+    def records(self, start:int = None, end:int = None):
+        """
+            Description: Yields (next_offset, row) for each record between
+                        the given byte offsets. next_offset is where the
+                        following record starts and can be used to resume.
+            Param: start - record boundary to start at (Default: first data row)
+            Param: end - stop once a record starts at or after this offset
+            Return: Generator of (int, tuple)
+        """
+        pos = self.data_offset if start is None else max(start, self.data_offset)
+        limit = self.size if end is None else min(end, self.size)
+        while pos < limit:
+            record_end = self._record_end(pos)
+            next_pos = self._next_start(record_end)
+            text = self._decode(pos, record_end)
+            if text:
+                yield next_pos, self._split(text)
+            pos = next_pos
+
+    def iter_chunks(self, chunk_bytes:int = 1 << 20, start:int = None):
+        """
+            Description: Groups records into chunks of roughly chunk_bytes.
+                        A chunk always ends on a record boundary.
+            Param: chunk_bytes - target size of each chunk in bytes
+            Param: start - record boundary to start at (Default: first data row)
+            Return: Generator of (start_offset, end_offset, rows)
+        """
+        data = self._map
+        pos = self.data_offset if start is None else max(start, self.data_offset)
+        while pos < self.size:
+            chunk_start, limit, rows = pos, min(pos + chunk_bytes, self.size), []
+            while pos < limit:
+                quote = data.find(self._quote, pos, limit)
+                # Before the first quote every newline ends a record
+                if quote == -1 and limit == self.size:
+                    plain_end = limit
+                else:
+                    plain_end = data.rfind(b'\n', pos, limit if quote == -1 else quote) + 1
+                if plain_end > pos:
+                    rows += self._split_lines(pos, plain_end)
+                    pos = plain_end
+                    continue
+                # The record at pos holds a quote or runs past limit
+                record_end = self._record_end(pos)
+                text = self._decode(pos, record_end)
+                if text:
+                    rows.append(self._split(text))
+                pos = self._next_start(record_end)
+            yield chunk_start, pos, rows
+
+    def _record_end(self, pos:int) -> int:
+        """
+            Description: Finds the end of the record starting at pos. A
+                        newline inside a quoted field does not end the
+                        record. As in the csv module, a quote only opens
+                        a quoted field as the field's first character.
+            Param: pos - start of record
+            Return: Offset of the terminating newline (or end of file)
+        """
+        data = self._map
+        end = data.find(b'\n', pos)
+        if end == -1:
+            end = self.size
+        if data.find(self._quote, pos, end) == -1:
+            return end
+        in_quotes, at_field_start = self._scan_quotes(pos, end, False, True)
+        while in_quotes and end < self.size:
+            start = end + 1
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = self.size
+            in_quotes, at_field_start = self._scan_quotes(start, end, True, False)
+        return end
+
+    def _scan_quotes(self, start:int, end:int, in_quotes:bool,
+                     at_field_start:bool) -> tuple:
+        """
+            Description: Tracks the quoting state across one line.
+            Param: start - start of the line
+            Param: end - end of the line (exclusive)
+            Param: in_quotes - inside a quoted field at start
+            Param: at_field_start - start is the first character of a field
+            Return: (in_quotes, at_field_start) at end
+        """
+        quote, delimiter = self._quote[0], self._delimiter[0]
+        line = self._map[start:end]
+        i = 0
+        while i < len(line):
+            byte = line[i]
+            if in_quotes:
+                if byte == quote:
+                    if i + 1 < len(line) and line[i + 1] == quote:
+                        i += 1
+                    else:
+                        in_quotes = False
+            elif byte == delimiter:
+                at_field_start = True
+                i += 1
+                continue
+            elif byte == quote and at_field_start:
+                in_quotes = True
+            at_field_start = False
+            i += 1
+        return in_quotes, at_field_start
+
+    def _next_start(self, record_end:int) -> int:
+        return min(record_end + 1, self.size)
+
+    def _decode(self, start:int, end:int) -> str:
+        text = self._map[start:end].decode(self.encoding)
+        return text[:-1] if text.endswith('\r') else text
+
+    def _split_lines(self, start:int, end:int) -> list:
+        """
+            Description: Splits a run of records without quotes, decoding
+                        it once. Blank lines are skipped.
+            Param: start - record boundary
+            Param: end - record boundary after start
+            Return: List of row tuples
+        """
+        text = self._map[start:end].decode(self.encoding)
+        lines = text.split('\n')
+        if '\r' in text:
+            lines = [line[:-1] if line.endswith('\r') else line for line in lines]
+        delimiter = self.delimiter
+        return [tuple(line.split(delimiter)) for line in lines if line]
+
+    def _split(self, text:str) -> tuple:
+        if self.quotechar in text:
+            return tuple(next(csv.reader([text], delimiter=self.delimiter,
+                                         quotechar=self.quotechar)))
+        return tuple(text.split(self.delimiter))
@@ -0,0 +1,214 @@
+"""
+Program: Directory
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Optional in-process read model of the employee table.
+             Records are __slots__ objects with hash indexes on id,
+             email and ext and a sorted (lname, id) index for
+             listings. The ext and listing indexes hold the records
+             themselves, so a read never goes from one index to another
+             and cannot see a record half removed by a refresh. The snapshot is kept current by replaying the
+             change log from the last seq it applied.
+
+
+Revisions:
+
+"""
+
+
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from flask import current_app
+from app.changes import CHANGE_FIELDS, OP_DELETE, changes_since, current_seq
+from app.exporter import iter_batches
+
+
+class EmployeeRecord:
+    __slots__ = CHANGE_FIELDS
+
+    def __init__(self, id, fname, lname, dept, ext, email):
+        self.id = id
+        self.fname = fname
+        self.lname = lname
+        self.dept = dept
+        self.ext = ext
+        self.email = email
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in CHANGE_FIELDS}
+
+
+def order_key(record:EmployeeRecord) -> tuple:
+    # lname is nullable; None cannot be compared with str
+    return (record.lname or '', record.id)
+
+
+class DirectorySnapshot:
+    """
+        Description: Snapshot of the employee table for lookups by id,
+                    email and extension and for (lname, id) listings.
+                    Writes are serialized by a lock; reads never block.
+                    Each read touches one index, and _order entries are
+                    (lname, id, record) tuples.
+    """
+
+    def __init__(self, refresh_interval:float = 1.0) -> None:
+        self.refresh_interval = refresh_interval
+        self.seq = 0
+        self.loaded = False
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_email = {}
+        self._by_ext = {}
+        self._order = []
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def load(self) -> None:
+        """
+            Description: Builds the snapshot from the table. The seq is
+                        read first; changes racing the load are replayed
+                        on the next refresh, and replays are idempotent.
+                        Must run inside an app context.
+            Return: None
+        """
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        # Builds new indexes and publishes them when complete, so
+        # readers never see a half loaded snapshot
+        seq = current_seq()
+        by_id, by_email, by_ext, order = {}, {}, {}, []
+        for batch in iter_batches():
+            for row in batch:
+                record = EmployeeRecord(*row)
+                by_id[record.id] = record
+                by_email[record.email] = record
+                by_ext[record.ext] = by_ext.get(record.ext, ()) + (record,)
+                order.append(order_key(record) + (record,))
+        order.sort(key=lambda entry: entry[:2])
+        self._by_id, self._by_email, self._by_ext, self._order = by_id, by_email, by_ext, order
+        self.seq = seq
+        self.loaded = True
+        self._checked = time.monotonic()
+
+    def refresh(self) -> int:
+        """
+            Description: Applies changes committed since the last refresh.
+                        Must run inside an app context.
+            Return: Number of changes applied
+        """
+        applied = 0
+        with self._lock:
+            if not self.loaded:
+                # A request that waited for another's first load
+                # finds it loaded and only catches up
+                self._load()
+                return 0
+            while True:
+                changes = changes_since(self.seq)
+                for change in changes:
+                    self._apply(change)
+                applied += len(changes)
+                if not changes:
+                    break
+                self.seq = changes[-1]['seq']
+            self._checked = time.monotonic()
+        return applied
+
+    def refresh_if_stale(self) -> None:
+        """
+            Description: Refreshes at most once per refresh_interval so
+                        hot reads do not query the database.
+            Return: None
+        """
+        if not self.loaded or time.monotonic() - self._checked >= self.refresh_interval:
+            self.refresh()
+
+    def get(self, emp_id:int) -> EmployeeRecord | None:
+        return self._by_id.get(emp_id)
+
+    def by_email(self, email:str) -> EmployeeRecord | None:
+        return self._by_email.get(email)
+
+    def by_ext(self, ext:str) -> list:
+        return list(self._by_ext.get(ext, ()))
+
+    def listing(self, offset:int = 0, limit:int = None) -> list:
+        """
+            Description: Returns records ordered by (lname, id).
+            Param: offset - records to skip
+            Param: limit - maximum records returned (Default: all)
+            Return: List of EmployeeRecord
+        """
+        end = None if limit is None else offset + limit
+        return [entry[2] for entry in self._order[offset:end]]
+
+    def memory_usage(self) -> int:
+        """
+            Description: Estimates the bytes held by records, their
+                        field values and the indexes.
+            Return: Size in bytes
+        """
+        size = sum(sys.getsizeof(index) for index in
+                   (self._by_id, self._by_email, self._by_ext, self._order))
+        for record in self._by_id.values():
+            size += sys.getsizeof(record)
+            size += sum(sys.getsizeof(getattr(record, field)) for field in CHANGE_FIELDS)
+        size += sum(sys.getsizeof(entry) for entry in self._order)
+        size += sum(sys.getsizeof(records) for records in self._by_ext.values())
+        return size
+
+    def stats(self) -> dict:
+        return {'enabled': True, 'loaded': self.loaded, 'seq': self.seq,
+                'records': len(self), 'memory_bytes': self.memory_usage()}
+
+    def _apply(self, change:dict) -> None:
+        self._remove(change['emp_id'])
+        if change['op'] != OP_DELETE:
+            data = change['data']
+            record = EmployeeRecord(*(data[field] for field in CHANGE_FIELDS))
+            self._by_id[record.id] = record
+            self._by_email[record.email] = record
+            self._by_ext[record.ext] = self._by_ext.get(record.ext, ()) + (record,)
+            insort(self._order, order_key(record) + (record,), key=lambda entry: entry[:2])
+
+    def _remove(self, emp_id:int) -> None:
+        record = self._by_id.pop(emp_id, None)
+        if record is None:
+            return
+        if self._by_email.get(record.email) is record:
+            del self._by_email[record.email]
+        records = tuple(other for other in self._by_ext.get(record.ext, ())
+                        if other is not record)
+        if records:
+            self._by_ext[record.ext] = records
+        else:
+            self._by_ext.pop(record.ext, None)
+        key = order_key(record)
+        index = bisect_left(self._order, key, key=lambda entry: entry[:2])
+        if index < len(self._order) and self._order[index][:2] == key:
+            del self._order[index]
+
+
+def get_directory() -> DirectorySnapshot | None:
+    """
+        Description: Returns the app's snapshot, refreshed if stale, or
+                    None when DIRECTORY_SNAPSHOT is off.
+        Return: DirectorySnapshot or None
+    """
+    if not current_app.config.get('DIRECTORY_SNAPSHOT'):
+        return None
+    snapshot = current_app.extensions.get('directory')
+    if snapshot is None:
+        snapshot = current_app.extensions.setdefault(
+            'directory',
+            DirectorySnapshot(current_app.config['DIRECTORY_REFRESH_INTERVAL']))
+    snapshot.refresh_if_stale()
+    return snapshot
@@ -0,0 +1,116 @@
+"""
+Program: Emails
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Allocates employee email addresses. The base address is
+             fname_lname@abnor.com; when it is taken the next variant
+             (fname_lname_2@, _3@, ...) is used. Taken variants are
+             found with an indexed prefix range on Employee.email
+             instead of letting the unique index fail the INSERT.
+             With department sharding the lookups go to the global
+             EmployeeLocator.email index, so uniqueness spans shards.
+
+
+Revisions:
+
+"""
+
+
+import re
+import sqlalchemy as sa
+from app.extensions import db
+from app.models import Employee, EmployeeLocator
+from app.sharding import sharding_enabled
+
+EMAIL_DOMAIN = 'abnor.com'
+# Upper bound for a prefix range scan (highest code point)
+PREFIX_END = '\U0010ffff'
+# Prefix ranges OR'ed into one query, well below SQLite's parameter limit
+LOOKUP_BATCH = 200
+VARIANT = re.compile(r'(.+)_(\d+)')
+
+
+def email_base(fname:str, lname:str) -> str:
+    return f'{fname.lower()}_{lname.lower()}'
+
+def email_variant(base:str, number:int) -> str:
+    if number == 1:
+        return f'{base}@{EMAIL_DOMAIN}'
+    return f'{base}_{number}@{EMAIL_DOMAIN}'
+
+def email_column():
+    return EmployeeLocator.email if sharding_enabled() else Employee.email
+
+def taken_variants(bases) -> dict:
+    """
+        Description: Finds the variant numbers already used for each
+                    base, one range query per LOOKUP_BATCH bases.
+        Param: bases - iterable of email bases
+        Return: Dict of base -> set of used variant numbers
+    """
+    bases = sorted(set(bases))
+    taken = {base: set() for base in bases}
+    suffix = f'@{EMAIL_DOMAIN}'
+    column = email_column()
+    for start in range(0, len(bases), LOOKUP_BATCH):
+        batch = bases[start:start + LOOKUP_BATCH]
+        query = sa.select(column).where(sa.or_(
+            *[column.between(base, base + PREFIX_END) for base in batch]))
+        for email in db.session.scalars(query):
+            if not email.endswith(suffix):
+                continue
+            local = email[:-len(suffix)]
+            if local in taken:
+                taken[local].add(1)
+            match = VARIANT.fullmatch(local)
+            if match and match.group(1) in taken:
+                taken[match.group(1)].add(int(match.group(2)))
+    return taken
+
+def allocate_emails(names:list) -> list:
+    """
+        Description: Allocates a free email for each (fname, lname),
+                    also avoiding clashes within the batch itself.
+        Param: names - list of (fname, lname) tuples
+        Return: List of emails in the same order
+    """
+    bases = [email_base(fname, lname) for fname, lname in names]
+    taken = taken_variants(bases)
+    emails = []
+    allocated = set()
+    for base in bases:
+        used = taken[base]
+        number = max(used) + 1 if used else 1
+        # ann_lee_2 can be both a base and a variant of ann_lee
+        while email_variant(base, number) in allocated:
+            number += 1
+        used.add(number)
+        email = email_variant(base, number)
+        allocated.add(email)
+        emails.append(email)
+    return emails
+
+def allocate_email(fname:str, lname:str) -> str:
+    """
+        Description: Allocates a free email for one employee.
+        Param: fname - first name
+        Param: lname - last name
+        Return: Email address
+    """
+    return allocate_emails([(fname, lname)])[0]
+
+def emails_in_use(emails) -> set:
+    """
+        Description: Returns which of the given emails already exist.
+        Param: emails - iterable of email addresses
+        Return: Set of existing emails
+    """
+    emails = list(set(emails))
+    found = set()
+    column = email_column()
+    for start in range(0, len(emails), LOOKUP_BATCH):
+        found.update(db.session.scalars(
+            sa.select(column).where(
+                column.in_(emails[start:start + LOOKUP_BATCH]))))
+    return found
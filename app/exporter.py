@@ -0,0 +1,144 @@
+"""
+Program: Exporter
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Streams the employee table as CSV or JSONL. Rows are read
+             in id order with keyset batches (WHERE id > last id), so
+             memory stays flat and no read transaction is held open
+             between batches. With department sharding only the shards
+             owning the requested departments are read, and their id
+             ordered batches are merged.
+
+
+Revisions:
+
+"""
+
+
+import csv
+import heapq
+import io
+import json
+import zlib
+from itertools import islice
+import sqlalchemy as sa
+from app.extensions import db
+from app.models import Employee
+from app import sharding
+from app.queries import LISTING_COLUMNS, LISTING_FIELDS
+
+EXPORT_FIELDS = LISTING_FIELDS
+EXPORT_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_batches(depts:list = None, batch_size:int = DEFAULT_BATCH_SIZE):
+    """
+        Description: Yields lists of employee rows in id order using
+                    keyset pagination. Must run inside an app context.
+        Param: depts - only export these departments (Default: all)
+        Param: batch_size - rows fetched per query
+        Return: Generator of lists of Row tuples
+    """
+    query = sa.select(*LISTING_COLUMNS).order_by(Employee.id).limit(batch_size)
+    if depts:
+        query = query.where(Employee.dept.in_(depts))
+
+    if not sharding.sharding_enabled():
+        yield from keyset_batches(db.session, query)
+        return
+
+    streams = [(row for batch in keyset_batches(sharding.shard_session(key), query)
+                for row in batch)
+               for key in sharding.shard_keys(depts)]
+    rows = heapq.merge(*streams, key=lambda row: row.id)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+def keyset_batches(session, query):
+    """
+        Description: Runs an id ordered, limited query in keyset batches.
+        Param: session - session to query
+        Param: query - select ordered by id with a limit
+        Return: Generator of lists of Row tuples
+    """
+    last_id = 0
+    while True:
+        batch = session.execute(query.where(Employee.id > last_id)).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+def format_csv(batches):
+    """
+        Description: Encodes row batches as CSV, header first.
+        Param: batches - iterable of row lists
+        Return: Generator of str, one per batch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+def format_jsonl(batches):
+    """
+        Description: Encodes row batches as JSON lines.
+        Param: batches - iterable of row lists
+        Return: Generator of str, one per batch
+    """
+    for batch in batches:
+        yield ''.join(json.dumps(row._asdict()) + '\n' for row in batch)
+
+def gzip_stream(chunks):
+    """
+        Description: Compresses a byte stream into gzip format on the fly.
+        Param: chunks - iterable of bytes
+        Return: Generator of compressed bytes
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def report_batches(batches, progress):
+    """
+        Description: Passes batches through, reporting the running row
+                    count after each one.
+        Param: batches - iterable of row lists
+        Param: progress - callable(rows)
+        Return: Generator of row lists
+    """
+    rows = 0
+    for batch in batches:
+        yield batch
+        rows += len(batch)
+        progress(rows)
+
+def export_stream(fmt:str = 'csv', depts:list = None, compress:bool = False,
+                  batch_size:int = DEFAULT_BATCH_SIZE, progress = None):
+    """
+        Description: Builds the export byte stream for a format.
+        Param: fmt - 'csv' or 'jsonl'
+        Param: depts - only export these departments (Default: all)
+        Param: compress - gzip the output (Default: False)
+        Param: batch_size - rows fetched per query
+        Param: progress - optional callable(rows) called after each batch
+        Return: Generator of bytes
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    formatter = format_csv if fmt == 'csv' else format_jsonl
+    batches = iter_batches(depts, batch_size)
+    if progress is not None:
+        batches = report_batches(batches, progress)
+    chunks = (text.encode('utf-8') for text in formatter(batches))
+    return gzip_stream(chunks) if compress else chunks
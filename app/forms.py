@@ -14,26 +14,28 @@ from flask_wtf import FlaskForm
 from wtforms import (SelectField, 
                      StringField, 
                      SubmitField)
-from wtforms.validators import InputRequired, Length, Regexp
+from wtforms.validators import InputRequired, ValidationError
+from app.validation import EMPLOYEE_RULES, department
 
-department = [('ENG', 'Engineering'),
-              ('HR', 'Human Resources'),
-              ('IT', 'Information Technology'),
-              ('MAN', 'Manufacturing'),
-              ("SAL", 'Sales'),
-         ]
+class Rule:
+    """Runs the shared validation rule for a field."""
+
+    def __init__(self, name):
+        self.rule = EMPLOYEE_RULES[name]
+
+    def __call__(self, form, field):
+        message = self.rule.check(field.data)
+        if message is not None:
+            raise ValidationError(message)
 
 class AddEmployeeForm(FlaskForm):
 
-    fname = StringField("First Name", validators=[InputRequired()])
-    lname = StringField("Last Name", validators=[InputRequired()])
+    fname = StringField("First Name", validators=[InputRequired(), Rule('fname')])
+    lname = StringField("Last Name", validators=[InputRequired(), Rule('lname')])
+    # SelectField already rejects values outside the choices
     dept = SelectField('Department', choices=department, 
                        validators=[InputRequired()])
-    ext = StringField("Extension", validators=[InputRequired(),
-                                               Length(min=4, max=4, 
-                                                      message='Extension must be between 4 numbers long'),
-                                               Regexp(regex='^[0-9]+$', 
-                                                      message='Only numeric characters are allowed.')])
+    ext = StringField("Extension", validators=[InputRequired(), Rule('ext')])
     submit = SubmitField("Add Employee")
 
 class UpdateEmployeeForm(AddEmployeeForm):
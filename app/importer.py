@@ -0,0 +1,182 @@
+"""
+Program: Importer
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Chunked CSV import pipeline. Each chunk is inserted and
+             committed together with a checkpoint row holding the byte
+             offset and row count reached, so an interrupted import
+             can resume from the last committed chunk.
+
+
+Revisions:
+
+"""
+
+
+import os
+from typing import NamedTuple
+import sqlalchemy as sa
+from app.changes import insert_employees
+from app.csv_reader import MappedCSVReader
+from app.emails import allocate_emails, emails_in_use
+from app.extensions import db
+from app.models import Employee, ImportCheckpoint
+from app.validation import BatchValidator
+
+DEFAULT_CHUNK_BYTES = 1 << 20
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportResult(NamedTuple):
+    rows: int
+    resumed_from: int
+    byte_offset: int
+    rejected: int = 0
+    errors: tuple = ()
+
+
+def get_checkpoint(csv_file:str, model) -> ImportCheckpoint | None:
+    """
+        Description: Looks up the checkpoint for a file and table.
+                    Must be called inside an app context.
+        Param: csv_file - path of the CSV file
+        Param: model - model class being populated
+        Return: Checkpoint record or None
+    """
+    return db.session.scalar(
+        sa.select(ImportCheckpoint).where(
+            ImportCheckpoint.source == os.path.abspath(csv_file),
+            ImportCheckpoint.table_name == model.__tablename__))
+
+def resumable_checkpoint(csv_file:str, model) -> ImportCheckpoint | None:
+    """
+        Description: Returns the checkpoint only if an unfinished import
+                    of the same (unchanged in size) file can be resumed.
+        Param: csv_file - path of the CSV file
+        Param: model - model class being populated
+        Return: Checkpoint record or None
+    """
+    checkpoint = get_checkpoint(csv_file, model)
+    if (checkpoint is None or checkpoint.completed
+            or checkpoint.file_size != os.path.getsize(csv_file)):
+        return None
+    return checkpoint
+
+def assign_emails(records:list, rejected:dict) -> list:
+    """
+        Description: Fills in missing employee emails with the allocator
+                    and rejects rows whose email is already in use, so a
+                    chunk never fails on the unique email index.
+        Param: records - list of (row position, field dict)
+        Param: rejected - row position -> errors, updated in place
+        Return: Records that can be inserted
+    """
+    missing = [record for _, record in records
+               if not record.get('email') and record.get('fname') and record.get('lname')]
+    if missing:
+        for record, email in zip(missing, allocate_emails(
+                [(record['fname'], record['lname']) for record in missing])):
+            record['email'] = email
+
+    in_use = emails_in_use(record['email'] for _, record in records if record.get('email'))
+    kept = []
+    for position, record in records:
+        email = record.get('email')
+        if email and email in in_use:
+            rejected[position] = ['email: Already in use.']
+            continue
+        if email:
+            in_use.add(email)
+        kept.append((position, record))
+    return kept
+
+def import_csv(csv_file:str, model, field_names:list, resume:bool = False,
+               chunk_bytes:int = DEFAULT_CHUNK_BYTES, progress = None) -> ImportResult:
+    """
+        Description: Loads a CSV file into a table one chunk at a time.
+                    Every chunk commits in the same transaction as its
+                    checkpoint update and, for employees, its change
+                    log entries. Employee rows failing validation or
+                    reusing an email are skipped and reported; missing
+                    emails are allocated. Must be called inside an app
+                    context.
+        Param: csv_file - path of the CSV file
+        Param: model - model class to populate
+        Param: field_names - CSV columns to load (must match model fields)
+        Param: resume - continue from the last committed chunk (Default: False)
+        Param: chunk_bytes - approximate size of each chunk in bytes
+        Param: progress - optional callable(rows, fraction) called at the
+                    start and after each committed chunk; an exception it
+                    raises stops the import at that chunk
+        Return: ImportResult with rows read, resume row, final offset,
+                rejected row count and the first rejected rows' errors
+    """
+    with MappedCSVReader(csv_file) as reader:
+        get_fields = reader.getter(field_names)
+
+        checkpoint = resumable_checkpoint(csv_file, model) if resume else None
+        if checkpoint is None:
+            checkpoint = get_checkpoint(csv_file, model)
+            if checkpoint is None:
+                checkpoint = ImportCheckpoint(source=os.path.abspath(csv_file),
+                                              table_name=model.__tablename__)
+                db.session.add(checkpoint)
+            checkpoint.file_size = reader.size
+            checkpoint.byte_offset = reader.data_offset
+            checkpoint.row_count = 0
+            checkpoint.rejected_count = 0
+            checkpoint.completed = False
+            db.session.commit()
+        resumed_from = checkpoint.row_count
+
+        validate = BatchValidator(field_names) if model is Employee else None
+        width = len(reader.header)
+        errors = []
+        insert = insert_employees if model is Employee else (
+            lambda values: db.session.execute(sa.insert(model), values))
+        data_bytes = max(reader.size - reader.data_offset, 1)
+        try:
+            if progress is not None:
+                progress(checkpoint.row_count,
+                         (checkpoint.byte_offset - reader.data_offset) / data_bytes)
+            for _, end, rows in reader.iter_chunks(chunk_bytes,
+                                                   start=checkpoint.byte_offset):
+                # Rows with the wrong number of fields cannot be projected
+                rejected = {position: [f'Wrong number of fields ({len(row)}, expected {width})']
+                            for position, row in enumerate(rows) if len(row) != width}
+                values = [get_fields(row) if position not in rejected else None
+                          for position, row in enumerate(rows)]
+                if validate is not None:
+                    positions = [position for position in range(len(rows))
+                                 if position not in rejected]
+                    failed = validate([values[position] for position in positions]
+                                      if rejected else values)
+                    rejected.update((positions[index], messages)
+                                    for index, messages in failed.items())
+                records = [(position, dict(zip(field_names, value)))
+                           for position, value in enumerate(values)
+                           if position not in rejected]
+                if model is Employee:
+                    records = assign_emails(records, rejected)
+                if rejected:
+                    for position in sorted(rejected)[:MAX_REPORTED_ERRORS - len(errors)]:
+                        errors.append((checkpoint.row_count + position + 1,
+                                       rejected[position]))
+                    checkpoint.rejected_count += len(rejected)
+                if records:
+                    insert([record for _, record in records])
+                checkpoint.byte_offset = end
+                checkpoint.row_count += len(rows)
+                db.session.commit()
+                if progress is not None:
+                    progress(checkpoint.row_count, (end - reader.data_offset) / data_bytes)
+            checkpoint.completed = True
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return ImportResult(checkpoint.row_count, resumed_from,
+                            checkpoint.byte_offset, checkpoint.rejected_count,
+                            tuple(errors))
@@ -0,0 +1,417 @@
+"""
+Program: Jobs
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Background jobs for long imports, exports and migrations. The Job
+             table is the queue: submit_job() adds a queued row, and a
+             JobRunner claims queued rows and runs them on a small
+             thread pool, so at most JOB_CONCURRENCY jobs compete with
+             request handling. Running jobs write their progress (rows,
+             rows/sec, ETA) to their row about once a second and stop
+             at the next progress report after a cancel request. Each
+             runner refreshes its running jobs' heartbeat every poll;
+             a running job whose heartbeat is older than JOB_STALE_AFTER
+             was orphaned by a process that died, and is failed (or
+             cancelled, if that was asked for) by the next sweep. The
+             sweep also copies shard changes such a process left behind
+             (see sharding.sync_changes).
+
+
+Revisions:
+
+"""
+
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import sqlalchemy as sa
+from flask import current_app
+from app.exporter import EXPORT_FORMATS, export_stream
+from app.extensions import db
+from app.importer import DEFAULT_CHUNK_BYTES, import_csv
+from app.migrations import migrate
+from app.models import Employee, Job
+from app.queries import count_employees
+from app import sharding
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+# Tables import jobs may populate
+JOB_MODELS = {'Employee': Employee}
+ORPHANED = 'Job runner stopped while the job was running'
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobProgress:
+    """
+        Description: Progress callback for a running job. Writes rows
+                    done, fraction, rate and ETA to the job row at most
+                    once per interval, then checks for a cancel request.
+                    The final report is always written and not cancelled.
+    """
+
+    def __init__(self, job:Job, interval:float) -> None:
+        self.job = job
+        self.interval = interval
+        self.started = None
+        self.start_rows = 0
+        self.start_fraction = 0.0
+        self.last_report = 0.0
+
+    def __call__(self, rows:int, fraction:float, final:bool = False) -> None:
+        now = time.monotonic()
+        if self.started is None:
+            self.started, self.start_rows, self.start_fraction = now, rows, fraction
+        elif not final and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = now - self.started
+        done = fraction - self.start_fraction
+        self.job.rows_done = rows
+        self.job.progress = min(fraction, 1.0)
+        self.job.rows_per_sec = (rows - self.start_rows) / elapsed if elapsed > 0 else None
+        self.job.eta_seconds = (elapsed * (1.0 - fraction) / done
+                                if done > 0 and fraction < 1.0 else None)
+        db.session.commit()
+        if final:
+            return
+        if db.session.scalar(sa.select(Job.cancel_requested).where(Job.id == self.job.id)):
+            raise JobCancelled()
+
+
+def check_params(kind:str, params:dict) -> dict:
+    """
+        Description: Validates and fills in defaults for job parameters.
+        Param: kind - 'import', 'export' or 'migrate'
+        Param: params - parameters as submitted
+        Return: Normalized parameters
+        Raises: ValueError with a message for the caller
+    """
+    if kind == 'import':
+        if not params.get('csv_file'):
+            raise ValueError('csv_file is required')
+        if params.get('table', 'Employee') not in JOB_MODELS:
+            raise ValueError(f"Unknown table '{params.get('table')}'")
+        fields = params.get('fields')
+        if not fields or not isinstance(fields, list):
+            raise ValueError('fields must be a list of column names')
+        return {'csv_file': os.path.abspath(params['csv_file']),
+                'table': params.get('table', 'Employee'),
+                'fields': fields,
+                'resume': bool(params.get('resume', False)),
+                'chunk_bytes': int(params.get('chunk_bytes') or DEFAULT_CHUNK_BYTES)}
+    if kind == 'export':
+        fmt = params.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}'")
+        output = params.get('output')
+        return {'format': fmt,
+                'depts': params.get('depts') or None,
+                'gzip': bool(params.get('gzip', False)),
+                'output': os.path.abspath(output) if output else None}
+    if kind == 'migrate':
+        target, batch_size, pause = (params.get('target'), params.get('batch_size'),
+                                     params.get('pause'))
+        return {'target': int(target) if target is not None else None,
+                'batch_size': int(batch_size) if batch_size else None,
+                'pause': float(pause) if pause is not None else None}
+    raise ValueError(f"Unknown job kind '{kind}'")
+
+def submit_job(kind:str, params:dict) -> Job:
+    """
+        Description: Queues a job and wakes the app's runner if it is
+                    running. Must be called inside an app context.
+        Param: kind - 'import', 'export' or 'migrate'
+        Param: params - job parameters (see check_params)
+        Return: The queued Job
+    """
+    job = Job(kind=kind, params=check_params(kind, params), status=QUEUED)
+    db.session.add(job)
+    db.session.commit()
+    runner = current_app.extensions.get('job_runner')
+    if runner is not None:
+        runner.wake()
+    return job
+
+def cancel_job(job:Job) -> Job:
+    """
+        Description: Cancels a queued job at once; a running job is
+                    flagged and stops at its next progress report, or is
+                    cancelled at once if its runner has gone.
+        Param: job - Job to cancel
+        Return: The Job
+    """
+    if job.status == QUEUED:
+        db.session.execute(sa.update(Job).where(Job.id == job.id, Job.status == QUEUED)
+                           .values(status=CANCELLED, finished_at=datetime.now()))
+    if job.status not in FINISHED:
+        job.cancel_requested = True
+    db.session.commit()
+    sweep_stale_jobs()
+    db.session.refresh(job)
+    return job
+
+def sweep_stale_jobs() -> int:
+    """
+        Description: Finishes running jobs whose heartbeat is older than
+                    JOB_STALE_AFTER: cancelled if a cancel was requested,
+                    otherwise failed.
+        Return: Number of jobs finished
+    """
+    now = datetime.now()
+    cutoff = now - timedelta(seconds=current_app.config['JOB_STALE_AFTER'])
+    stale = (Job.status == RUNNING,
+             sa.func.coalesce(Job.heartbeat_at, Job.started_at) < cutoff)
+    swept = db.session.execute(
+        sa.update(Job).where(*stale, Job.cancel_requested)
+        .values(status=CANCELLED, eta_seconds=None, finished_at=now)).rowcount
+    swept += db.session.execute(
+        sa.update(Job).where(*stale)
+        .values(status=FAILED, error=ORPHANED, eta_seconds=None, finished_at=now)).rowcount
+    db.session.commit()
+    return swept
+
+def claim_next_job() -> Job | None:
+    """
+        Description: Marks the oldest queued job as running. The status
+                    check in the UPDATE keeps two runners from claiming
+                    the same job.
+        Return: Claimed Job or None when the queue is empty
+    """
+    while True:
+        job_id = db.session.scalar(
+            sa.select(Job.id).where(Job.status == QUEUED).order_by(Job.id).limit(1))
+        if job_id is None:
+            return None
+        now = datetime.now()
+        claimed = db.session.execute(
+            sa.update(Job).where(Job.id == job_id, Job.status == QUEUED)
+            .values(status=RUNNING, started_at=now, heartbeat_at=now)).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+
+def export_path(job:Job) -> str:
+    """
+        Description: Output file of an export job; defaults to
+                    JOB_EXPORT_FOLDER/employees-<id>.<format>[.gz].
+        Param: job - export Job
+        Return: Absolute path
+    """
+    if job.params.get('output'):
+        return job.params['output']
+    folder = current_app.config['JOB_EXPORT_FOLDER'] or os.path.join(
+        current_app.instance_path, 'exports')
+    suffix = '.gz' if job.params['gzip'] else ''
+    return os.path.join(folder, f"employees-{job.id}.{job.params['format']}{suffix}")
+
+def run_import(job:Job, progress:JobProgress) -> dict:
+    params = job.params
+    result = import_csv(params['csv_file'], JOB_MODELS[params['table']], params['fields'],
+                        resume=params['resume'], chunk_bytes=params['chunk_bytes'],
+                        progress=progress)
+    return {'rows': result.rows, 'resumed_from': result.resumed_from,
+            'rejected': result.rejected, 'errors': [list(error) for error in result.errors]}
+
+def run_export(job:Job, progress:JobProgress) -> dict:
+    params = job.params
+    total = count_employees(params['depts'])
+    path = export_path(job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + '.part'
+    rows = 0
+
+    def report(count):
+        nonlocal rows
+        rows = count
+        progress(count, count / total if total else 1.0)
+
+    progress(0, 0.0)
+    try:
+        with open(partial, 'wb') as file:
+            for chunk in export_stream(params['format'], params['depts'],
+                                       params['gzip'], progress=report):
+                file.write(chunk)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return {'rows': rows, 'path': path}
+
+def run_migrate(job:Job, progress:JobProgress) -> dict:
+    params = job.params
+    applied, rows = migrate(params['target'], params['batch_size'], params['pause'],
+                            progress=progress)
+    return {'rows': rows, 'applied': applied}
+
+JOB_HANDLERS = {'import': run_import, 'export': run_export, 'migrate': run_migrate}
+
+def run_job(job:Job) -> Job:
+    """
+        Description: Runs a claimed job to completion, recording its
+                    result, error or cancellation. Must be called inside
+                    an app context.
+        Param: job - Job in the running state
+        Return: The finished Job
+    """
+    progress = JobProgress(job, current_app.config['JOB_PROGRESS_INTERVAL'])
+    try:
+        job.result = JOB_HANDLERS[job.kind](job, progress)
+        progress(job.result['rows'], 1.0, final=True)
+        job.status = SUCCEEDED
+    except JobCancelled:
+        db.session.rollback()
+        job.status = CANCELLED
+    except Exception as e:
+        db.session.rollback()
+        job.status = FAILED
+        job.error = str(e)
+    job.eta_seconds = None
+    job.finished_at = datetime.now()
+    db.session.commit()
+    return job
+
+def job_status(job:Job) -> dict:
+    return {'id': job.id, 'kind': job.kind, 'status': job.status, 'params': job.params,
+            'rows_done': job.rows_done, 'progress': round(job.progress, 4),
+            'rows_per_sec': job.rows_per_sec and round(job.rows_per_sec, 1),
+            'eta_seconds': job.eta_seconds and round(job.eta_seconds, 1),
+            'cancel_requested': job.cancel_requested,
+            'result': job.result, 'error': job.error,
+            'created_at': job.created_at.isoformat(),
+            'started_at': job.started_at and job.started_at.isoformat(),
+            'finished_at': job.finished_at and job.finished_at.isoformat()}
+
+
+class JobRunner:
+    """
+        Description: Claims queued jobs and runs them on a thread pool
+                    of `concurrency` workers. A dispatcher thread checks
+                    the queue when woken and every poll_interval seconds,
+                    which also picks up jobs queued by other processes,
+                    refreshes the running jobs' heartbeat and sweeps
+                    jobs orphaned by other runners.
+    """
+
+    def __init__(self, app, concurrency:int, poll_interval:float) -> None:
+        self.app = app
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.active = 0
+        self.running = set()
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix='job')
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch_loop,
+                                                name='job-dispatcher', daemon=True)
+                self._thread.start()
+
+    def wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def stop(self, wait:bool = True) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    def heartbeat(self) -> None:
+        with self._cond:
+            job_ids = list(self.running)
+        if job_ids:
+            db.session.execute(sa.update(Job).where(Job.id.in_(job_ids), Job.status == RUNNING)
+                               .values(heartbeat_at=datetime.now()))
+            db.session.commit()
+
+    def dispatch(self) -> int:
+        """
+            Description: Refreshes the heartbeat, sweeps orphaned jobs
+                        and shard changes, and starts queued jobs while
+                        workers are free.
+            Return: Number of jobs started
+        """
+        started = 0
+        with self.app.app_context():
+            self.heartbeat()
+            sweep_stale_jobs()
+            if sharding.sharding_enabled():
+                sharding.sync_changes()
+            while self.active < self.concurrency:
+                job = claim_next_job()
+                if job is None:
+                    break
+                with self._cond:
+                    self.active += 1
+                    self.running.add(job.id)
+                self._executor.submit(self._run, job.id)
+                started += 1
+        return started
+
+    def _run(self, job_id:int) -> None:
+        try:
+            with self.app.app_context():
+                run_job(db.session.get(Job, job_id))
+        finally:
+            with self._cond:
+                self.active -= 1
+                self.running.discard(job_id)
+                self._cond.notify_all()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+            try:
+                self.dispatch()
+            except Exception as e:
+                self.app.logger.error(f'Job dispatch failed: {e}')
+            with self._cond:
+                if not self._stopping:
+                    self._cond.wait(self.poll_interval)
+
+def get_job_runner(start:bool = True) -> JobRunner:
+    """
+        Description: Returns the app's runner, creating (and starting)
+                    it on first use.
+        Param: start - start the dispatcher thread (Default: True)
+        Return: JobRunner
+    """
+    app = current_app._get_current_object()
+    runner = app.extensions.get('job_runner')
+    if runner is None:
+        runner = app.extensions.setdefault(
+            'job_runner', JobRunner(app, app.config['JOB_CONCURRENCY'],
+                                    app.config['JOB_POLL_INTERVAL']))
+    if start:
+        runner.start()
+    return runner
+
+def start_job_runner() -> None:
+    # before_request hook: the web app's runner starts with its first
+    # request and then also runs jobs queued from manage_db.py
+    if current_app.config['JOB_AUTOSTART'] and 'job_runner' not in current_app.extensions:
+        get_job_runner()
+
+def init_jobs(app) -> None:
+    app.before_request(start_job_runner)
@@ -0,0 +1,268 @@
+"""
+Program: Migrations
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Online, additive schema migrations, mostly for the employee
+             table (which every shard also holds; other tables live in
+             the main database only). A migration may add nullable (or
+             defaulted) columns, add
+             indexes and backfill new columns from SQL expressions.
+             Column adds are metadata-only in SQLite, and backfills run
+             in short keyset batches (WHERE id > last id) with a pause
+             between them, so the app keeps serving reads and writes
+             throughout. Applied versions, and how far each backfill
+             got, are kept in the schema_version table; an interrupted
+             migration picks up from its last committed batch.
+
+             Every change must also be made to the models, so new
+             databases built with create_all() match; stamp() marks
+             them up to date. A database from before schema_version
+             existed counts as version 1. Code writing new rows should
+             fill new columns before the backfill starts.
+
+
+Revisions:
+
+"""
+
+
+import time
+from datetime import datetime
+from typing import NamedTuple
+import sqlalchemy as sa
+from flask import current_app
+from app.extensions import db
+from app.models import SchemaVersion
+from app import sharding
+
+TABLE = 'employee'
+RUNNING = 'running'
+APPLIED = 'applied'
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    # (column name, SQLAlchemy type, SQL default or None)
+    columns: tuple = ()
+    # (index name, column names)
+    indexes: tuple = ()
+    unique_indexes: tuple = ()
+    # (column name, SQL expression over the row)
+    backfill: tuple = ()
+    table: str = TABLE
+
+
+MIGRATIONS = (
+    Migration(1, 'baseline'),
+    Migration(2, 'listing and department indexes',
+              indexes=(('ix_employee_lname_id', ('lname', 'id')),
+                       ('ix_employee_dept_id', ('dept', 'id')))),
+    Migration(3, 'job heartbeat', columns=(('heartbeat_at', sa.DateTime(), None),),
+              table='job'),
+    Migration(4, 'shard change log', columns=(('shard', sa.String(50), None),
+                                              ('shard_seq', sa.Integer(), None)),
+              unique_indexes=(('ix_employee_change_shard_seq', ('shard', 'shard_seq')),),
+              table='employee_change'),
+)
+
+
+def versioned() -> bool:
+    return sa.inspect(db.session.connection()).has_table(SchemaVersion.__tablename__)
+
+def applied_versions() -> dict:
+    if not versioned():
+        return {}
+    return {record.version: record for record in db.session.scalars(sa.select(SchemaVersion))}
+
+def current_version() -> int:
+    if not versioned():
+        return 0
+    return db.session.scalar(sa.select(sa.func.max(SchemaVersion.version))
+                             .where(SchemaVersion.status == APPLIED)) or 0
+
+def start_versioning(migrations:tuple = MIGRATIONS) -> None:
+    """
+        Description: Creates the schema_version table if missing, and
+                    records an existing unversioned employee table as
+                    the baseline (version 1).
+        Param: migrations - migration list (Default: MIGRATIONS)
+        Return: None
+    """
+    SchemaVersion.__table__.create(db.session.connection(), checkfirst=True)
+    if not applied_versions() and sa.inspect(db.session.connection()).has_table(TABLE):
+        db.session.add(SchemaVersion(version=migrations[0].version, name=migrations[0].name,
+                                     status=APPLIED, backfill_keys={},
+                                     applied_at=datetime.now()))
+    db.session.commit()
+
+def pending_migrations(migrations:tuple = MIGRATIONS, target:int = None) -> list:
+    applied = {version for version, record in applied_versions().items()
+               if record.status == APPLIED}
+    return [migration for migration in migrations
+            if migration.version not in applied
+            and (target is None or migration.version <= target)]
+
+def migration_targets(migration:Migration) -> list:
+    """
+        Description: Sessions holding the migration's table: the main
+                    database, plus every shard for the employee table
+                    when sharding is on.
+        Param: migration - Migration to apply
+        Return: List of (target name, session)
+    """
+    targets = [('main', db.session)]
+    if migration.table == TABLE:
+        targets += [(key, sharding.shard_session(key)) for key in sharding.shard_keys()]
+    return targets
+
+def apply_schema(session, migration:Migration) -> None:
+    """
+        Description: Adds the migration's missing columns and indexes.
+        Param: session - session of the target database
+        Param: migration - Migration to apply
+        Return: None
+    """
+    connection = session.connection()
+    if not sa.inspect(connection).has_table(migration.table):
+        # create_all() will build it from the model, change included
+        return
+    preparer = connection.dialect.identifier_preparer
+    table = preparer.quote(migration.table)
+    existing = {column['name'] for column in sa.inspect(connection).get_columns(migration.table)}
+    for name, column_type, default in migration.columns:
+        if name in existing:
+            continue
+        ddl = f'ALTER TABLE {table} ADD COLUMN {preparer.quote(name)} ' \
+              f'{column_type.compile(dialect=connection.dialect)}'
+        if default is not None:
+            ddl += f' DEFAULT {default}'
+        session.execute(sa.text(ddl))
+    indexes = [('INDEX', index) for index in migration.indexes] + \
+              [('UNIQUE INDEX', index) for index in migration.unique_indexes]
+    for kind, (name, columns) in indexes:
+        session.execute(sa.text(
+            f'CREATE {kind} IF NOT EXISTS {preparer.quote(name)} ON {table} '
+            f"({', '.join(preparer.quote(column) for column in columns)})"))
+
+def backfill(target:str, session, migration:Migration, record:SchemaVersion,
+             batch_size:int, pause:float, report) -> None:
+    """
+        Description: Fills the migration's new columns in id ordered
+                    batches, one short transaction each, only touching
+                    rows still NULL. Each batch commits together with
+                    the last id reached.
+        Param: target - target name (key in record.backfill_keys)
+        Param: session - session of the target database
+        Param: migration - Migration with backfill expressions
+        Param: record - SchemaVersion row of the migration
+        Param: batch_size - rows per batch
+        Param: pause - seconds to sleep between batches
+        Param: report - callable(rows) after each batch
+        Return: None
+    """
+    names = [name for name, _ in migration.backfill]
+    table = sa.table(migration.table, sa.column('id'), *[sa.column(name) for name in names])
+    values = {name: sa.literal_column(expression) for name, expression in migration.backfill}
+    last_id = (record.backfill_keys or {}).get(target, 0)
+    while True:
+        ids = session.scalars(sa.select(table.c.id).where(table.c.id > last_id)
+                              .order_by(table.c.id).limit(batch_size)).all()
+        if not ids:
+            return
+        session.execute(sa.update(table).values(values).where(
+            table.c.id > last_id, table.c.id <= ids[-1],
+            sa.or_(*[table.c[name].is_(None) for name in names])))
+        last_id = ids[-1]
+        record.backfill_keys = dict(record.backfill_keys or {}, **{target: last_id})
+        record.rows_backfilled += len(ids)
+        # Also commits the shard session (see sharding)
+        db.session.commit()
+        report(len(ids))
+        if pause:
+            time.sleep(pause)
+
+def count_backfill_rows(pending:list) -> int:
+    return sum(session.scalar(sa.select(sa.func.count()).select_from(sa.table(migration.table)))
+               for migration in pending if migration.backfill
+               for _, session in migration_targets(migration))
+
+def migrate(target:int = None, batch_size:int = None, pause:float = None,
+            progress = None, migrations:tuple = MIGRATIONS) -> tuple:
+    """
+        Description: Applies pending migrations in version order. Must
+                    be called inside an app context.
+        Param: target - last version to apply (Default: all)
+        Param: batch_size - backfill rows per batch (Default: MIGRATION_BATCH_SIZE)
+        Param: pause - seconds between batches (Default: MIGRATION_PAUSE)
+        Param: progress - optional callable(rows, fraction) for backfill progress
+        Param: migrations - migration list (Default: MIGRATIONS)
+        Return: (applied versions, rows backfilled)
+    """
+    batch_size = batch_size or current_app.config['MIGRATION_BATCH_SIZE']
+    pause = current_app.config['MIGRATION_PAUSE'] if pause is None else pause
+    start_versioning(migrations)
+    pending = pending_migrations(migrations, target)
+    total = count_backfill_rows(pending)
+    done = 0
+
+    def report(rows):
+        nonlocal done
+        done += rows
+        if progress is not None:
+            progress(done, min(done / total, 1.0) if total else 1.0)
+
+    if progress is not None:
+        progress(0, 0.0)
+    applied = []
+    for migration in pending:
+        record = db.session.get(SchemaVersion, migration.version)
+        if record is None:
+            record = SchemaVersion(version=migration.version, name=migration.name,
+                                   status=RUNNING, backfill_keys={})
+            db.session.add(record)
+        targets = migration_targets(migration)
+        for _, session in targets:
+            apply_schema(session, migration)
+        db.session.commit()
+
+        if migration.backfill:
+            for name, session in targets:
+                backfill(name, session, migration, record, batch_size, pause, report)
+        record.status = APPLIED
+        record.applied_at = datetime.now()
+        db.session.commit()
+        applied.append(migration.version)
+    return applied, done
+
+def stamp(migrations:tuple = MIGRATIONS) -> None:
+    """
+        Description: Marks every migration applied without running it,
+                    for databases just built from the models.
+        Param: migrations - migration list (Default: MIGRATIONS)
+        Return: None
+    """
+    SchemaVersion.__table__.create(db.session.connection(), checkfirst=True)
+    recorded = applied_versions()
+    now = datetime.now()
+    for migration in migrations:
+        record = recorded.get(migration.version)
+        if record is None:
+            db.session.add(SchemaVersion(version=migration.version, name=migration.name,
+                                         status=APPLIED, backfill_keys={}, applied_at=now))
+        elif record.status != APPLIED:
+            record.status, record.applied_at = APPLIED, now
+    db.session.commit()
+
+def migration_status(migrations:tuple = MIGRATIONS) -> list:
+    recorded = applied_versions()
+    status = []
+    for migration in migrations:
+        record = recorded.get(migration.version)
+        status.append({'version': migration.version, 'name': migration.name,
+                       'status': record.status if record else 'pending',
+                       'rows_backfilled': record.rows_backfilled if record else 0,
+                       'applied_at': record.applied_at.isoformat()
+                       if record and record.applied_at else None})
+    return status
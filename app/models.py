@@ -11,15 +11,88 @@ Revisions:
 """
 
 
+from datetime import datetime
 import sqlalchemy as sa
 import sqlalchemy.orm as so
 from .extensions import db 
 
 
 class Employee(db.Model):
+    # Listing order and department filters; added online by migration 2
+    __table_args__ = (sa.Index('ix_employee_lname_id', 'lname', 'id'),
+                      sa.Index('ix_employee_dept_id', 'dept', 'id'))
+
     id: so.Mapped[int] = so.mapped_column(primary_key=True)
     fname: so.Mapped[str] = so.mapped_column(sa.String(20))
     lname: so.Mapped[str] = so.mapped_column(sa.String(20))
     dept: so.Mapped[str] = so.mapped_column(sa.String(20))
     ext: so.Mapped[str] = so.mapped_column(sa.String(4))
     email: so.Mapped[str] = so.mapped_column(sa.String(50), index=True, unique=True)
+
+class ImportCheckpoint(db.Model):
+    __table_args__ = (sa.UniqueConstraint('source', 'table_name'),)
+
+    id: so.Mapped[int] = so.mapped_column(primary_key=True)
+    source: so.Mapped[str] = so.mapped_column(sa.String(255))
+    table_name: so.Mapped[str] = so.mapped_column(sa.String(50))
+    file_size: so.Mapped[int] = so.mapped_column(sa.BigInteger)
+    byte_offset: so.Mapped[int] = so.mapped_column(sa.BigInteger, default=0)
+    row_count: so.Mapped[int] = so.mapped_column(default=0)
+    rejected_count: so.Mapped[int] = so.mapped_column(default=0)
+    completed: so.Mapped[bool] = so.mapped_column(default=False)
+    updated_at: so.Mapped[datetime] = so.mapped_column(default=datetime.now, 
+                                                      onupdate=datetime.now)
+
+class EmployeeChange(db.Model):
+    # Sharded changes are first logged in their shard's own table and
+    # then copied here with the shard seq (added by migration 4)
+    __table_args__ = (sa.Index('ix_employee_change_shard_seq', 'shard', 'shard_seq', unique=True),
+                      {'sqlite_autoincrement': True})
+
+    seq: so.Mapped[int] = so.mapped_column(primary_key=True)
+    emp_id: so.Mapped[int] = so.mapped_column(index=True)
+    op: so.Mapped[str] = so.mapped_column(sa.String(10))
+    data: so.Mapped[dict] = so.mapped_column(sa.JSON)
+    created_at: so.Mapped[datetime] = so.mapped_column(default=datetime.now)
+    shard: so.Mapped[str | None] = so.mapped_column(sa.String(50))
+    shard_seq: so.Mapped[int | None]
+
+class EmployeeLocator(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id: so.Mapped[int] = so.mapped_column(primary_key=True)
+    email: so.Mapped[str | None] = so.mapped_column(sa.String(50), index=True, unique=True)
+    shard: so.Mapped[str] = so.mapped_column(sa.String(50))
+
+class ShardSequence(db.Model):
+    # Counters kept in each shard database: the last employee id taken
+    # from the shard's id range and the last change copied by sync
+    name: so.Mapped[str] = so.mapped_column(sa.String(50), primary_key=True)
+    value: so.Mapped[int]
+
+class Job(db.Model):
+    id: so.Mapped[int] = so.mapped_column(primary_key=True)
+    kind: so.Mapped[str] = so.mapped_column(sa.String(20))
+    params: so.Mapped[dict] = so.mapped_column(sa.JSON)
+    status: so.Mapped[str] = so.mapped_column(sa.String(20), index=True, default='queued')
+    rows_done: so.Mapped[int] = so.mapped_column(default=0)
+    progress: so.Mapped[float] = so.mapped_column(default=0.0)
+    rows_per_sec: so.Mapped[float | None]
+    eta_seconds: so.Mapped[float | None]
+    cancel_requested: so.Mapped[bool] = so.mapped_column(default=False)
+    result: so.Mapped[dict | None] = so.mapped_column(sa.JSON)
+    error: so.Mapped[str | None] = so.mapped_column(sa.Text)
+    created_at: so.Mapped[datetime] = so.mapped_column(default=datetime.now)
+    started_at: so.Mapped[datetime | None]
+    finished_at: so.Mapped[datetime | None]
+    # Refreshed by the runner while the job runs (added by migration 3)
+    heartbeat_at: so.Mapped[datetime | None]
+
+class SchemaVersion(db.Model):
+    version: so.Mapped[int] = so.mapped_column(primary_key=True, autoincrement=False)
+    name: so.Mapped[str] = so.mapped_column(sa.String(100))
+    status: so.Mapped[str] = so.mapped_column(sa.String(20), default='running')
+    rows_backfilled: so.Mapped[int] = so.mapped_column(default=0)
+    backfill_keys: so.Mapped[dict] = so.mapped_column(sa.JSON, default=dict)
+    started_at: so.Mapped[datetime] = so.mapped_column(default=datetime.now)
+    applied_at: so.Mapped[datetime | None]
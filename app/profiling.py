@@ -0,0 +1,250 @@
+"""
+Program: Profiling
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Opt-in request profiling. A request is profiled when an
+             admin sends the X-Profile header, or at random with
+             probability PROFILE_SAMPLE_RATE. A sampler thread reads the
+             request thread's stack every PROFILE_INTERVAL seconds and
+             counts collapsed stacks (the input format of flamegraph.pl
+             and speedscope); SQL statements run by the request are
+             timed, and samples taken during a statement end in a
+             "sql: ..." frame. The sampler only runs while a profiled
+             request is in flight, and the slowest PROFILE_KEEP profiles
+             are kept in memory for the admin endpoints.
+
+
+Revisions:
+
+"""
+
+
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+import sqlalchemy as sa
+from flask import current_app, g, has_app_context, request
+from app.admin import is_admin_request
+
+PROFILE_HEADER = 'X-Profile'
+# Longest statement text kept per query and per flamegraph frame
+MAX_STATEMENT = 2000
+MAX_SQL_FRAME = 120
+
+
+def frame_label(code) -> str:
+    path = code.co_filename.replace(os.sep, '/').split('/')
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+class RequestProfile:
+    """
+        Description: Samples and SQL statements of one request.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, method:str, path:str, endpoint:str) -> None:
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.status = None
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.duration = None
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.queries = []
+        self.max_queries = current_app.config['PROFILE_MAX_QUERIES']
+        self.current_sql = None
+        self._query_started = None
+
+    def add_sample(self, frame) -> None:
+        labels = []
+        while frame is not None:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        sql = self.current_sql
+        if sql is not None:
+            labels.append('sql: ' + ' '.join(sql.split())[:MAX_SQL_FRAME])
+        self.stacks[';'.join(labels)] += 1
+
+    def query_started(self, statement:str) -> None:
+        self.current_sql = statement
+        self._query_started = time.perf_counter()
+
+    def query_finished(self, statement:str, executemany:bool) -> None:
+        elapsed = time.perf_counter() - (self._query_started or time.perf_counter())
+        self.current_sql = None
+        if len(self.queries) < self.max_queries:
+            self.queries.append({'statement': statement[:MAX_STATEMENT],
+                                 'duration_ms': round(elapsed * 1000, 3),
+                                 'executemany': executemany})
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    def summary(self) -> dict:
+        return {'id': self.id, 'method': self.method, 'path': self.path,
+                'endpoint': self.endpoint, 'status': self.status,
+                'started_at': self.started_at.isoformat(),
+                'duration_ms': round(self.duration * 1000, 3),
+                'samples': sum(self.stacks.values()),
+                'queries': len(self.queries),
+                'query_ms': round(sum(query['duration_ms'] for query in self.queries), 3)}
+
+    def folded(self) -> str:
+        """
+            Description: Collapsed stacks, one "frame;frame;frame count"
+                        line per distinct stack.
+            Return: str
+        """
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def sql_text(self) -> str:
+        lines = [f'-- {self.method} {self.path} ({self.summary()["duration_ms"]} ms)\n']
+        for query in self.queries:
+            many = ', executemany' if query['executemany'] else ''
+            lines.append(f"\n-- {query['duration_ms']} ms{many}\n{query['statement']};\n")
+        return ''.join(lines)
+
+
+class StackSampler:
+    """
+        Description: Samples the stacks of registered request threads.
+                    The sampling thread starts with the first profiled
+                    request and exits when none are left.
+    """
+
+    def __init__(self, interval:float) -> None:
+        self.interval = interval
+        self.active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, profile:RequestProfile) -> None:
+        with self._lock:
+            self.active[profile.thread_id] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='profile-sampler',
+                                                daemon=True)
+                self._thread.start()
+
+    def remove(self, profile:RequestProfile) -> None:
+        with self._lock:
+            if self.active.get(profile.thread_id) is profile:
+                del self.active[profile.thread_id]
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self.active:
+                    self._thread = None
+                    return
+                targets = list(self.active.items())
+            frames = sys._current_frames()
+            for thread_id, profile in targets:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    profile.add_sample(frame)
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """
+        Description: Keeps the slowest `keep` finished profiles.
+    """
+
+    def __init__(self, keep:int) -> None:
+        self.keep = keep
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def add(self, profile:RequestProfile) -> None:
+        with self._lock:
+            self.profiles.append(profile)
+            self.profiles.sort(key=lambda kept: kept.duration, reverse=True)
+            del self.profiles[self.keep:]
+
+    def slowest(self, limit:int = None) -> list:
+        with self._lock:
+            return self.profiles[:limit]
+
+    def get(self, profile_id:int) -> RequestProfile | None:
+        with self._lock:
+            return next((profile for profile in self.profiles if profile.id == profile_id), None)
+
+
+def should_profile() -> bool:
+    if request.endpoint is None or request.endpoint == 'static' \
+            or request.blueprint == 'admin':
+        return False
+    if PROFILE_HEADER in request.headers and is_admin_request():
+        return True
+    rate = current_app.config['PROFILE_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+def start_profile() -> None:
+    if not should_profile():
+        return
+    profile = g._profile = RequestProfile(request.method, request.path, request.endpoint)
+    current_app.extensions['profile_sampler'].add(profile)
+
+def tag_response(response):
+    profile = g.get('_profile')
+    if profile is not None:
+        profile.status = response.status_code
+        response.headers['X-Profile-Id'] = str(profile.id)
+    return response
+
+def finish_profile(exc = None) -> None:
+    """
+        Description: teardown_request hook; runs after a streamed
+                    response has been sent, so the whole body is profiled.
+        Param: exc - unhandled exception, if any
+        Return: None
+    """
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return
+    current_app.extensions['profile_sampler'].remove(profile)
+    profile.finish()
+    if profile.status is None:
+        profile.status = 500
+    current_app.extensions['profile_store'].add(profile)
+
+def _active_profile() -> RequestProfile | None:
+    if not has_app_context():
+        return None
+    profile = g.get('_profile')
+    if profile is None or profile.thread_id != threading.get_ident():
+        return None
+    return profile
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _active_profile()
+    if profile is not None:
+        profile.query_started(statement)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _active_profile()
+    if profile is not None:
+        profile.query_finished(statement, executemany)
+
+def init_profiling(app) -> None:
+    app.extensions['profile_sampler'] = StackSampler(app.config['PROFILE_INTERVAL'])
+    app.extensions['profile_store'] = ProfileStore(app.config['PROFILE_KEEP'])
+    app.before_request(start_profile)
+    app.after_request(tag_response)
+    app.teardown_request(finish_profile)
+    if not sa.event.contains(sa.Engine, 'before_cursor_execute', _before_cursor_execute):
+        sa.event.listen(sa.Engine, 'before_cursor_execute', _before_cursor_execute)
+        sa.event.listen(sa.Engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,117 @@
+"""
+Program: Queries
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Read-only listing queries. Only the displayed columns are
+             selected and rows come back as Core Row tuples, so no ORM
+             instances are built, tracked in the identity map or
+             instrumented. With department sharding each shard is read
+             in the same order and the streams are merged.
+
+
+Revisions:
+
+"""
+
+
+import heapq
+from itertools import islice
+import sqlalchemy as sa
+from app.extensions import db
+from app.models import Employee
+from app import sharding
+
+LISTING_FIELDS = ('id', 'fname', 'lname', 'dept', 'ext', 'email')
+LISTING_COLUMNS = tuple(getattr(Employee, field) for field in LISTING_FIELDS)
+# Rows fetched from the cursor at a time when streaming a page
+STREAM_BATCH = 200
+
+
+def listing_query():
+    """
+        Description: Employees ordered for listings by (lname, id).
+        Return: Select of LISTING_COLUMNS
+    """
+    return sa.select(*LISTING_COLUMNS).order_by(Employee.lname, Employee.id)
+
+def listing_key(row) -> tuple:
+    """
+        Description: Python sort key matching listing_query's order
+                    (SQLite sorts NULL names first).
+        Param: row - listing row
+        Return: Sort key
+    """
+    return (row.lname is not None, row.lname or '', row.id)
+
+def count_employees(depts:list = None) -> int:
+    query = sa.select(sa.func.count()).select_from(Employee)
+    if depts:
+        query = query.where(Employee.dept.in_(depts))
+    if sharding.sharding_enabled():
+        return sum(result.scalar() for result in sharding.fan_out(query, depts))
+    return db.session.scalar(query)
+
+def merged_listing(offset:int, limit:int, yield_per:int = None):
+    """
+        Description: One listing slice across all shards. Each shard
+                    returns its first offset + limit rows in listing
+                    order and the sorted streams are merged, so deep
+                    pages cost more than on a single database.
+        Param: offset - rows to skip
+        Param: limit - rows to return
+        Param: yield_per - cursor batch size (Default: fetch all)
+        Return: Iterator of listing rows
+    """
+    query = listing_query().limit(offset + limit)
+    if yield_per:
+        query = query.execution_options(yield_per=yield_per)
+    return islice(heapq.merge(*sharding.fan_out(query), key=listing_key),
+                  offset, offset + limit)
+
+def listing_page(page:int, per_page:int) -> tuple:
+    """
+        Description: Reads one listing page. Must run inside an app context.
+        Param: page - 1-based page number
+        Param: per_page - rows per page
+        Return: (rows, total_pages) where rows are Row tuples with
+                attribute access (row.lname)
+    """
+    page = max(page, 1)
+    if sharding.sharding_enabled():
+        rows = list(merged_listing((page - 1) * per_page, per_page))
+    else:
+        rows = db.session.execute(
+            listing_query().limit(per_page).offset((page - 1) * per_page)).all()
+    total_pages = -(-count_employees() // per_page)
+    return rows, total_pages
+
+def listing_stream(page:int, per_page:int) -> tuple:
+    """
+        Description: Like listing_page, but the rows are a generator that
+                    runs the query when iterated and fetches STREAM_BATCH
+                    rows at a time. Meant for stream_template, so large
+                    pages are never held in memory.
+        Param: page - 1-based page number
+        Param: per_page - rows per page
+        Return: (rows, total_pages); rows is an empty list when the
+                page is past the end, so templates can test it
+    """
+    page = max(page, 1)
+    total = count_employees()
+    if (page - 1) * per_page >= total:
+        return [], -(-total // per_page)
+
+    def rows():
+        if sharding.sharding_enabled():
+            yield from merged_listing((page - 1) * per_page, per_page, STREAM_BATCH)
+            return
+        result = db.session.execute(
+            listing_query().limit(per_page).offset((page - 1) * per_page)
+            .execution_options(yield_per=STREAM_BATCH))
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    return rows(), -(-total // per_page)
@@ -11,22 +11,40 @@ Revisions:
 """
 
 
+from math import ceil
 from flask import (abort, 
                    Blueprint,  
+                   current_app,
                    flash, 
                    render_template, 
                    redirect, 
                    request, 
+                   Response,
+                   stream_template,
+                   stream_with_context,
                    url_for)
+from app.admission import limit_writes
+from app.changes import (OP_DELETE,
+                         OP_INSERT,
+                         OP_UPDATE,
+                         record_change)
+from app.directory import get_directory
+from app.emails import allocate_email
+from app.exporter import EXPORT_FORMATS, export_stream
 from app.extensions import db
 from app.forms import AddEmployeeForm, UpdateEmployeeForm
 from app.models import Employee
+from app.queries import listing_page, listing_stream
+from app import sharding
 
 
 pages = Blueprint('pages', __name__)
 
 def get_or_404(model, id):
-    record = db.session.get(model, id)
+    if model is Employee and sharding.sharding_enabled():
+        record = sharding.get_employee(id)
+    else:
+        record = db.session.get(model, id)
     if record is None:
         abort(404)
     return record
@@ -36,25 +54,42 @@ def get_or_404(model, id):
 def index():
     head_title = 'Home'
     page_title = 'Employees'
-    page = request.args.get('page', default=1, type=int) 
-    rows_per_page = 3 
-
-    try:
-        emps_paginated = Employee.query.order_by(Employee.lname.asc()) \
-            .paginate(page=page, per_page=rows_per_page, error_out=False)
-    except Exception as e:
-        flash(f'Database error: \n{e}', 'error')
+    page = max(request.args.get('page', default=1, type=int), 1)
+    rows_per_page = request.args.get('per_page', type=int)
+    if rows_per_page is not None:
+        rows_per_page = min(max(rows_per_page, 1), current_app.config['MAX_PAGE_SIZE'])
+    per_page = rows_per_page or current_app.config['ROWS_PER_PAGE']
+
+    # Large pages are streamed so the table is never built in memory
+    streamed = per_page >= current_app.config['STREAM_PAGE_SIZE']
+    render = stream_template if streamed else render_template
+
+    emps, total_pages = [], 0
+    directory = get_directory()
+    if directory is not None:
+        emps = directory.listing((page - 1) * per_page, per_page)
+        total_pages = ceil(len(directory) / per_page)
+    else:
+        try:
+            if streamed:
+                emps, total_pages = listing_stream(page, per_page)
+            else:
+                emps, total_pages = listing_page(page, per_page)
+        except Exception as e:
+            flash(f'Database error: \n{e}', 'error')
 
-    return render_template(
+    return render(
         'index.html',
         head_title=head_title,
         page_title=page_title,
-        emps=emps_paginated.items, 
+        emps=emps, 
         current_page=page,
-        total_pages=emps_paginated.pages
+        total_pages=total_pages,
+        per_page=rows_per_page
     )
 
 @pages.route('/add_emp/', methods=['GET', 'POST'])
+@limit_writes
 def add_emp(): 
     head_title = 'Add'
     page_title = 'Add Employee'
@@ -65,7 +100,7 @@ def add_emp():
         lname = form.lname.data
         dept = form.dept.data
         ext = form.ext.data
-        email = f'{fname.lower()}_{lname.lower()}@abnor.com'
+        email = allocate_email(fname, lname)
         emps = Employee(fname=fname,
                             lname=lname,
                             dept=dept,
@@ -73,7 +108,11 @@ def add_emp():
                             email=email
                             )
         try:    
-            db.session.add(emps)
+            if sharding.sharding_enabled():
+                sharding.add_employee(emps)
+            else:
+                db.session.add(emps)
+            record_change(OP_INSERT, emps)
             db.session.commit()
             flash(f'{emps.fname} {emps.lname} added to database', 'success')
             return redirect(url_for('pages.index')) 
@@ -89,12 +128,17 @@ def add_emp():
                     form=form)
 
 @pages.route('/delete_emp/<int:emp_id>/', methods=['POST'])
+@limit_writes
 def delete_emp(emp_id):
     try:
         emp = get_or_404(Employee, emp_id)
 
         if emp:
-            db.session.delete(emp)
+            record_change(OP_DELETE, emp)
+            if sharding.sharding_enabled():
+                sharding.delete_employee(emp)
+            else:
+                db.session.delete(emp)
             db.session.commit()
             flash(f'{emp.fname} {emp.lname} deleted from database', 'success')   
     except Exception as e:
@@ -105,6 +149,7 @@ def delete_emp(emp_id):
     return redirect(url_for('pages.index'))
 
 @pages.route('/update_emp/<int:emp_id>/', methods=['GET', 'POST'])
+@limit_writes
 def update_emp(emp_id):
     head_title = 'Update'
     page_title = 'Update Employee'
@@ -115,10 +160,16 @@ def update_emp(emp_id):
 
     if form.validate_on_submit():
         try:
-            emp.fname = form.fname.data
-            emp.lname = form.lname.data
-            emp.dept = form.dept.data
-            emp.ext = form.ext.data
+            fields = {'fname': form.fname.data,
+                      'lname': form.lname.data,
+                      'dept': form.dept.data,
+                      'ext': form.ext.data}
+            if sharding.sharding_enabled():
+                emp = sharding.update_employee(emp, fields)
+            else:
+                for name, value in fields.items():
+                    setattr(emp, name, value)
+            record_change(OP_UPDATE, emp)
             db.session.commit()
             flash(f'{emp.fname} {emp.lname} updated in database', 'success')
             return redirect(url_for('pages.index'))
@@ -132,4 +183,22 @@ def update_emp(emp_id):
                            head_title=head_title,
                            page_title=page_title,
                            form=form,
-                           emp=emp)
\ No newline at end of file
+                           emp=emp)
+
+@pages.route('/export/<fmt>/')
+def export_emps(fmt):
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    depts = request.args.getlist('dept')
+    compress = request.args.get('gzip', default=0, type=int) == 1
+
+    filename = f'employees.{fmt}'
+    mimetype = EXPORT_FORMATS[fmt]
+    if compress:
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    stream = export_stream(fmt, depts=depts, compress=compress)
+    return Response(stream_with_context(stream),
+                    mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
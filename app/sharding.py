@@ -0,0 +1,473 @@
+"""
+Program: Sharding
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Optional department-sharded storage. Employee rows live
+             in the shard database owning their department, so writes
+             for different departments go to different SQLite files.
+             The default database keeps a small EmployeeLocator row per
+             employee (global id, email, shard), which keeps emails
+             unique across shards and routes updates by id, and the
+             change log.
+
+             Shard sessions join the lifetime of db.session: they are
+             committed just before it commits, rolled back with it and
+             closed with the app context.
+
+             Each shard hands out employee ids from its own range
+             (ID_RANGE ids per shard), and logs changes in its own
+             employee_change table in the same transaction as the rows.
+             Once the shards have committed, db.session's commit copies
+             their new changes to the main log, together with the
+             locator updates they imply (such as claiming a new
+             employee's email). A write thus commits once per database
+             and never holds one database's write lock while waiting for
+             another. Changes whose process stopped before copying them
+             are copied later by sync_changes(), which the job runner
+             calls.
+
+             Every write still commits once on the main database, so
+             that file stays the point where writes queue and caps the
+             write throughput; bench_sharding.py measures it.
+
+Revisions:
+
+"""
+
+
+import threading
+from datetime import datetime, timedelta
+from itertools import groupby, takewhile
+import sqlalchemy as sa
+import sqlalchemy.orm as so
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session as FlaskSession
+from app.extensions import db
+from app.models import Employee, EmployeeChange, EmployeeLocator, ShardSequence
+from app.validation import department
+
+EMPLOYEE_COLUMNS = tuple(Employee.__table__.columns.keys())
+SHARD_TABLES = (Employee.__table__, EmployeeChange.__table__, ShardSequence.__table__)
+# Employee ids per shard; shard_N takes ids from N * ID_RANGE + 1
+ID_RANGE = 10 ** 12
+# Ids a process takes from a shard's range at a time
+ID_BLOCK = 100
+ID_SEQUENCE = 'employee_id'
+SYNCED_SEQUENCE = 'synced_change'
+
+_id_lock = threading.Lock()
+
+
+def shard_binds(shard_uris:dict) -> tuple:
+    """
+        Description: Builds shard keys for a department -> database URI
+                    map. Departments sharing a URI share a shard.
+        Param: shard_uris - dict of department code -> database URI
+        Return: (SHARD_URIS dict of key -> URI, DEPARTMENT_SHARDS dict)
+        Raises: ValueError if a department has no database
+    """
+    missing = [code for code, _ in department if code not in shard_uris]
+    if missing:
+        raise ValueError(f"No shard database for departments {', '.join(missing)}")
+    keys, departments = {}, {}
+    for dept, uri in shard_uris.items():
+        key = keys.get(uri)
+        if key is None:
+            key = keys[uri] = f'shard_{len(keys) + 1}'
+        departments[dept] = key
+    return {key: uri for uri, key in keys.items()}, departments
+
+def sharding_enabled() -> bool:
+    return bool(current_app.config.get('DEPARTMENT_SHARDS'))
+
+def shard_for(dept:str) -> str:
+    """
+        Description: Bind key of the shard owning a department.
+        Param: dept - department code
+        Return: Bind key
+    """
+    try:
+        return current_app.config['DEPARTMENT_SHARDS'][dept]
+    except KeyError:
+        raise ValueError(f"No shard for department '{dept}'") from None
+
+def shard_keys(depts:list = None) -> list:
+    """
+        Description: Shards to read, optionally only those owning depts.
+        Param: depts - department codes (Default: all shards)
+        Return: Sorted list of bind keys (empty when not sharded)
+    """
+    shards = current_app.config['DEPARTMENT_SHARDS'] or {}
+    if depts:
+        return sorted({shards[dept] for dept in depts if dept in shards})
+    return sorted(set(shards.values()))
+
+def shard_engine(key:str) -> sa.Engine:
+    return current_app.extensions['shard_engines'][key]
+
+def _join_main_session() -> None:
+    # Begins db.session's transaction (without touching the database)
+    # so its rollback always fires, and rolls back the shard work
+    if db.session().get_transaction() is None:
+        db.session.begin()
+
+def shard_session(key:str) -> so.Session:
+    """
+        Description: The app context's session for a shard.
+        Param: key - shard bind key
+        Return: Session bound to the shard engine
+    """
+    _join_main_session()
+    sessions = g.setdefault('_shard_sessions', {})
+    if key not in sessions:
+        sessions[key] = so.Session(bind=shard_engine(key))
+    return sessions[key]
+
+def _id_base(key:str) -> int:
+    # Shard keys are numbered (shard_1, shard_2...), main database ids
+    # stay below the first range
+    return int(key.rsplit('_', 1)[1]) * ID_RANGE
+
+def _take_ids(connection, key:str, count:int) -> int:
+    table = ShardSequence.__table__
+    last = connection.execute(
+        sa.update(table).where(table.c.name == ID_SEQUENCE)
+        .values(value=table.c.value + count).returning(table.c.value)).scalar()
+    if last is None:
+        last = _id_base(key) + count
+        connection.execute(sa.insert(table).values(name=ID_SEQUENCE, value=last))
+    return last
+
+def allocate_ids(key:str, count:int) -> list:
+    """
+        Description: Hands out the next employee ids from a shard's own
+                    range. The process takes them from the shard in
+                    blocks of at least ID_BLOCK, committed at once so
+                    they are never handed out twice, and most inserts
+                    do not touch the counter; ids left in a block when
+                    the process stops are skipped.
+        Param: key - shard bind key
+        Param: count - ids needed
+        Return: List of ids
+    """
+    blocks = current_app.extensions['shard_id_blocks']
+    with _id_lock:
+        next_id, end = blocks.get(key, (0, 0))
+        if end - next_id >= count:
+            blocks[key] = (next_id + count, end)
+            return list(range(next_id, next_id + count))
+        session = g.get('_shard_sessions', {}).get(key)
+        if session is not None and session.in_transaction():
+            # The shard may be locked by this very transaction, so take
+            # them in it (and give them back if it rolls back)
+            last = _take_ids(session.connection(), key, count)
+            return list(range(last - count + 1, last + 1))
+        take = max(count, ID_BLOCK)
+        with shard_engine(key).begin() as connection:
+            end = _take_ids(connection, key, take) + 1
+        blocks[key] = (end - take + count, end)
+        return list(range(end - take, end - take + count))
+
+def log_changes(key:str, values:list) -> None:
+    """
+        Description: Adds change rows to a shard's own log, in the same
+                    transaction as its employee rows. db.session copies
+                    them to the main log when it commits.
+        Param: key - shard bind key
+        Param: values - list of dicts with emp_id, op and data
+        Return: None
+    """
+    table = EmployeeChange.__table__
+    result = shard_session(key).execute(
+        sa.insert(table).returning(table.c.seq, table.c.created_at, sort_by_parameter_order=True),
+        values)
+    g.setdefault('_shard_changes', []).extend(
+        dict(value, shard=key, shard_seq=seq, created_at=created_at)
+        for value, (seq, created_at) in zip(values, result))
+
+def get_employee(emp_id:int) -> Employee | None:
+    locator = db.session.get(EmployeeLocator, emp_id)
+    if locator is None:
+        return None
+    return shard_session(locator.shard).get(Employee, emp_id)
+
+def add_employee(emp:Employee) -> Employee:
+    """
+        Description: Adds a new employee to its shard, with an id from
+                    the shard's range. Its locator is added when the
+                    change is copied to the main database.
+        Param: emp - transient Employee
+        Return: The same Employee, now with an id
+    """
+    key = shard_for(emp.dept)
+    emp.id = allocate_ids(key, 1)[0]
+    session = shard_session(key)
+    session.add(emp)
+    session.flush()
+    return emp
+
+def update_employee(emp:Employee, fields:dict) -> Employee:
+    """
+        Description: Applies field changes, moving the row to another
+                    shard when its department moves.
+        Param: emp - Employee loaded from its shard
+        Param: fields - new field values
+        Return: The updated Employee (a new instance after a move)
+    """
+    old_key, key = shard_for(emp.dept), shard_for(fields.get('dept', emp.dept))
+    if key != old_key:
+        data = {column: getattr(emp, column) for column in EMPLOYEE_COLUMNS}
+        data.update(fields)
+        shard_session(old_key).delete(emp)
+        emp = Employee(**data)
+        shard_session(key).add(emp)
+    else:
+        for name, value in fields.items():
+            setattr(emp, name, value)
+    shard_session(key).flush()
+    return emp
+
+def delete_employee(emp:Employee) -> None:
+    shard_session(shard_for(emp.dept)).delete(emp)
+
+def insert_employees(values:list) -> list:
+    """
+        Description: Bulk insert: one executemany per shard, with ids
+                    from the shard's range.
+        Param: values - list of dicts of Employee fields
+        Return: Inserted rows (all columns, with ids) in input order
+    """
+    rows = [{column: value.get(column) for column in EMPLOYEE_COLUMNS} for value in values]
+    by_shard = {}
+    for row in rows:
+        by_shard.setdefault(shard_for(row['dept']), []).append(row)
+    for key, shard_rows in by_shard.items():
+        for row, emp_id in zip(shard_rows, allocate_ids(key, len(shard_rows))):
+            row['id'] = emp_id
+        shard_session(key).execute(sa.insert(Employee), shard_rows)
+    return rows
+
+def move_to_shards(batch_size:int = 1000) -> int:
+    """
+        Description: Moves employee rows left in the main database
+                    (from before sharding was turned on) into their
+                    shards, keeping their ids, in id ordered batches.
+                    Employees added with sharding on take ids from the
+                    shards' ranges, above these, so it may run at any
+                    time. Each batch is copied to the shards and committed
+                    before it is removed from the main database, so an
+                    interrupted move can simply be run again.
+        Param: batch_size - rows per batch (Default: 1000)
+        Return: Rows moved
+        Raises: ValueError if a department has no shard
+    """
+    table = Employee.__table__
+    unknown = db.session.scalars(
+        sa.select(table.c.dept).distinct().where(
+            sa.or_(table.c.dept.is_(None),
+                   table.c.dept.not_in(list(current_app.config['DEPARTMENT_SHARDS']))))).all()
+    if unknown:
+        raise ValueError(f"No shard for departments {', '.join(map(str, unknown))}")
+
+    moved = 0
+    while True:
+        rows = [dict(row) for row in db.session.execute(
+            sa.select(table).order_by(table.c.id).limit(batch_size)).mappings()]
+        if not rows:
+            return moved
+        ids = [row['id'] for row in rows]
+        by_shard = {}
+        for row in rows:
+            by_shard.setdefault(shard_for(row['dept']), []).append(row)
+        for key, shard_rows in by_shard.items():
+            session = shard_session(key)
+            # Rows copied by an interrupted earlier run are replaced
+            session.execute(sa.delete(table).where(table.c.id.in_(ids)))
+            session.execute(sa.insert(table), shard_rows)
+        db.session.execute(sa.insert(EmployeeLocator),
+                           [{'id': row['id'], 'email': row['email'], 'shard': shard_for(row['dept'])}
+                            for row in rows])
+        db.session.execute(sa.delete(table).where(table.c.id.in_(ids)))
+        # Commits the shards first (see _commit_shards)
+        db.session.commit()
+        moved += len(rows)
+
+def fan_out(query, depts:list = None) -> list:
+    """
+        Description: Runs a read query on every shard, or only on the
+                    shards owning depts.
+        Param: query - select statement
+        Param: depts - department codes (Default: all shards)
+        Return: List of results, one per shard
+    """
+    return [shard_session(key).execute(query) for key in shard_keys(depts)]
+
+def create_all() -> None:
+    for key in shard_keys():
+        db.metadata.create_all(shard_engine(key), tables=SHARD_TABLES)
+
+def drop_all() -> None:
+    for key in shard_keys():
+        db.metadata.drop_all(shard_engine(key), tables=SHARD_TABLES)
+
+def _shard_sessions() -> list:
+    if not has_app_context():
+        return []
+    return list(g.get('_shard_sessions', {}).values())
+
+def _copy_changes(session, changes:list) -> None:
+    """
+        Description: Adds shard changes to the main change log, with
+                    the locator updates they imply, in session.
+        Param: session - main database session
+        Param: changes - change dicts from log_changes() or sync_changes()
+        Return: None
+        Raises: IntegrityError if a new employee's email is taken
+    """
+    # app.changes imports this module
+    from app.changes import OP_DELETE, OP_INSERT
+    table = EmployeeLocator.__table__
+    for op, run in groupby(changes, key=lambda change: change['op']):
+        run = list(run)
+        if op == OP_DELETE:
+            session.execute(sa.delete(table).where(
+                table.c.id.in_([change['emp_id'] for change in run])))
+        elif op == OP_INSERT:
+            session.execute(sa.insert(table), [
+                {'id': change['emp_id'], 'email': change['data']['email'],
+                 'shard': change['shard']} for change in run])
+        else:
+            session.execute(
+                sa.update(table).where(table.c.id == sa.bindparam('emp_id'))
+                .values(email=sa.bindparam('email'), shard=sa.bindparam('shard')),
+                [{'emp_id': change['emp_id'], 'email': change['data']['email'],
+                  'shard': change['shard']} for change in run])
+    session.execute(sa.insert(EmployeeChange.__table__), changes)
+
+def _claimed_elsewhere(session, changes:list) -> list:
+    """
+        Description: Finds new employees whose email already belongs to
+                    another employee.
+        Param: session - main database session
+        Param: changes - change dicts
+        Return: The conflicting insert changes
+    """
+    from app.changes import OP_INSERT
+    inserts = {change['data']['email']: change for change in changes
+               if change['op'] == OP_INSERT and change['data'].get('email')}
+    if not inserts:
+        return []
+    owners = session.execute(sa.select(EmployeeLocator.email, EmployeeLocator.id)
+                             .where(EmployeeLocator.email.in_(list(inserts))))
+    return [inserts[email] for email, emp_id in owners if emp_id != inserts[email]['emp_id']]
+
+def _undo_inserts(changes:list) -> None:
+    """
+        Description: Removes new employees, and their change rows, from
+                    their shards again.
+        Param: changes - insert change dicts
+        Return: None
+    """
+    by_shard = {}
+    for change in changes:
+        by_shard.setdefault(change['shard'], []).append(change)
+    for key, shard_changes in by_shard.items():
+        with shard_engine(key).begin() as connection:
+            connection.execute(sa.delete(Employee).where(
+                Employee.id.in_([change['emp_id'] for change in shard_changes])))
+            connection.execute(sa.delete(EmployeeChange).where(
+                EmployeeChange.seq.in_([change['shard_seq'] for change in shard_changes])))
+
+def _set_sequence(connection, name:str, value:int) -> None:
+    if not connection.execute(sa.update(ShardSequence).where(ShardSequence.name == name)
+                              .values(value=value)).rowcount:
+        connection.execute(sa.insert(ShardSequence).values(name=name, value=value))
+
+def sync_changes(batch_size:int = 1000) -> int:
+    """
+        Description: Copies shard changes that never reached the main
+                    database, because their process stopped between its
+                    shard and main commits, once they are older than
+                    SHARD_SYNC_AFTER. New employees whose email was
+                    claimed meanwhile are removed from their shard
+                    instead. The last change checked is kept per shard.
+        Param: batch_size - changes read per batch (Default: 1000)
+        Return: Changes copied
+    """
+    cutoff = datetime.now() - timedelta(seconds=current_app.config['SHARD_SYNC_AFTER'])
+    copied = 0
+    for key in shard_keys():
+        engine = shard_engine(key)
+        while True:
+            with engine.connect() as connection:
+                last = connection.scalar(sa.select(ShardSequence.value)
+                                         .where(ShardSequence.name == SYNCED_SEQUENCE)) or 0
+                rows = connection.execute(
+                    sa.select(EmployeeChange.seq, EmployeeChange.emp_id, EmployeeChange.op,
+                              EmployeeChange.data, EmployeeChange.created_at)
+                    .where(EmployeeChange.seq > last)
+                    .order_by(EmployeeChange.seq).limit(batch_size)).all()
+            # Newer changes may still be on their way from their writer
+            changes = [{'shard': key, 'shard_seq': row.seq, 'emp_id': row.emp_id,
+                        'op': row.op, 'data': row.data, 'created_at': row.created_at}
+                       for row in takewhile(lambda row: row.created_at <= cutoff, rows)]
+            if not changes:
+                break
+            seqs = [change['shard_seq'] for change in changes]
+            done = set(db.session.scalars(sa.select(EmployeeChange.shard_seq).where(
+                EmployeeChange.shard == key, EmployeeChange.shard_seq.between(seqs[0], seqs[-1]))))
+            missing = [change for change in changes if change['shard_seq'] not in done]
+            conflicts = _claimed_elsewhere(db.session, missing)
+            _undo_inserts(conflicts)
+            try:
+                _copy_changes(db.session, [change for change in missing
+                                           if change not in conflicts])
+                db.session.commit()
+            except sa.exc.IntegrityError:
+                # Another process is copying the same changes
+                db.session.rollback()
+                break
+            with engine.begin() as connection:
+                _set_sequence(connection, SYNCED_SEQUENCE, seqs[-1])
+            copied += len(missing) - len(conflicts)
+            if len(changes) < batch_size:
+                break
+    return copied
+
+def _commit_shards(session) -> None:
+    for shard in _shard_sessions():
+        shard.commit()
+    changes = g.pop('_shard_changes', None) if has_app_context() else None
+    if changes:
+        try:
+            _copy_changes(session, changes)
+        except sa.exc.IntegrityError:
+            # Another writer claimed an email first; the other changes
+            # stay in their shard's log for sync_changes()
+            _undo_inserts(_claimed_elsewhere(session, changes))
+            raise
+
+def _rollback_shards(session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        for shard in _shard_sessions():
+            shard.rollback()
+        if has_app_context():
+            g.pop('_shard_changes', None)
+
+def close_shard_sessions(exc = None) -> None:
+    for shard in _shard_sessions():
+        shard.close()
+    g.pop('_shard_sessions', None)
+    g.pop('_shard_changes', None)
+
+def init_sharding(app) -> None:
+    # Shard engines are kept apart from SQLALCHEMY_BINDS so that
+    # db.create_all() and the models' default bind are unaffected
+    app.extensions['shard_id_blocks'] = {}
+    app.extensions['shard_engines'] = {
+        key: sa.create_engine(uri) for key, uri in (app.config['SHARD_URIS'] or {}).items()}
+    if not sa.event.contains(FlaskSession, 'before_commit', _commit_shards):
+        sa.event.listen(FlaskSession, 'before_commit', _commit_shards)
+        sa.event.listen(FlaskSession, 'after_soft_rollback', _rollback_shards)
+    app.teardown_appcontext(close_shard_sessions)
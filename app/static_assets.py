@@ -0,0 +1,119 @@
+"""
+Program: Static Assets
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Content-hashed static files. build_manifest() copies each
+             static file to name.<hash>.ext and records the mapping in
+             manifest.json; at runtime url_for('static') emits the
+             hashed names, which are served as immutable.
+
+
+Revisions:
+
+"""
+
+
+import hashlib
+import json
+import os
+import shutil
+from flask import current_app, request
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+
+
+def file_hash(path:str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+def hashed_name(filename:str, digest:str) -> str:
+    root, ext = os.path.splitext(filename)
+    return f'{root}.{digest}{ext}'
+
+def build_manifest(static_folder:str) -> dict:
+    """
+        Description: Fingerprints every static file and writes the
+                    manifest. Copies from an earlier build that are no
+                    longer current are removed.
+        Param: static_folder - the app's static folder
+        Return: Manifest dict of filename -> hashed filename
+    """
+    manifest_path = os.path.join(static_folder, MANIFEST_NAME)
+    old = load_manifest(static_folder)
+    old_hashed = set(old.values())
+
+    manifest = {}
+    for root, _, files in os.walk(static_folder):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            filename = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            if filename == MANIFEST_NAME or filename in old_hashed:
+                continue
+            target = hashed_name(filename, file_hash(path))
+            shutil.copyfile(path, os.path.join(static_folder, target))
+            manifest[filename] = target
+
+    for stale in old_hashed - set(manifest.values()):
+        stale_path = os.path.join(static_folder, stale)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    with open(manifest_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return manifest
+
+def load_manifest(static_folder:str) -> dict:
+    path = os.path.join(static_folder, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+def fingerprint_static(endpoint:str, values:dict) -> None:
+    """
+        Description: url_defaults hook; swaps a static filename for its
+                    hashed name when it is in the manifest.
+        Param: endpoint - endpoint url_for is building
+        Param: values - url_for arguments (modified in place)
+        Return: None
+    """
+    if endpoint == 'static':
+        hashed = current_app.extensions['static_manifest'].get(values.get('filename'))
+        if hashed:
+            values['filename'] = hashed
+
+def cache_static(response):
+    """
+        Description: after_request hook marking hashed static files as
+                    cacheable forever.
+        Param: response - outgoing response
+        Return: Response
+    """
+    if request.endpoint == 'static' and response.status_code == 200:
+        filename = (request.view_args or {}).get('filename')
+        if filename in current_app.extensions['static_hashed']:
+            # Replaces the no-cache set by send_file, which would make
+            # browsers revalidate anyway
+            response.headers['Cache-Control'] = \
+                f"public, max-age={current_app.config['STATIC_MAX_AGE']}, immutable"
+    return response
+
+def refresh_manifest(app) -> None:
+    """
+        Description: (Re)loads the manifest built for the app's static folder.
+        Param: app - Flask application
+        Return: None
+    """
+    manifest = load_manifest(app.static_folder) if app.static_folder else {}
+    app.extensions['static_manifest'] = manifest
+    app.extensions['static_hashed'] = frozenset(manifest.values())
+
+def init_static_assets(app) -> None:
+    refresh_manifest(app)
+    app.url_defaults(fingerprint_static)
+    app.after_request(cache_static)
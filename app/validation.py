@@ -0,0 +1,118 @@
+"""
+Program: Validation
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Employee validation rules shared by the forms, the CSV
+             importer and the bulk API. Patterns are compiled and
+             choices are held in sets once, and whole batches of rows
+             are checked column by column.
+
+
+Revisions:
+
+"""
+
+
+import re
+
+department = [('ENG', 'Engineering'),
+              ('HR', 'Human Resources'),
+              ('IT', 'Information Technology'),
+              ('MAN', 'Manufacturing'),
+              ("SAL", 'Sales'),
+         ]
+
+REQUIRED_MESSAGE = 'This field is required.'
+CHOICE_MESSAGE = 'Not a valid choice.'
+
+
+class FieldRule:
+    """
+        Description: Validation rule for one field. check() returns the
+                    first error message, or None when the value is valid.
+    """
+    __slots__ = ('required', 'min_length', 'max_length', 'length_message',
+                 'pattern', 'pattern_message', 'choices')
+
+    def __init__(self, required:bool = True, length:tuple = None,
+                 length_message:str = None, pattern:str = None,
+                 pattern_message:str = None, choices = None) -> None:
+        self.required = required
+        self.min_length, self.max_length = length or (None, None)
+        self.length_message = length_message
+        self.pattern = re.compile(pattern) if pattern else None
+        self.pattern_message = pattern_message
+        self.choices = frozenset(choices) if choices is not None else None
+
+    def check(self, value) -> str | None:
+        if not value:
+            return REQUIRED_MESSAGE if self.required else None
+        if self.min_length is not None and not (
+                self.min_length <= len(value) <= self.max_length):
+            return self.length_message
+        if self.pattern is not None and not self.pattern.match(value):
+            return self.pattern_message
+        if self.choices is not None and value not in self.choices:
+            return CHOICE_MESSAGE
+        return None
+
+
+EMPLOYEE_RULES = {
+    'fname': FieldRule(),
+    'lname': FieldRule(),
+    'dept': FieldRule(choices=[code for code, _ in department]),
+    'ext': FieldRule(length=(4, 4),
+                     length_message='Extension must be between 4 numbers long',
+                     pattern='^[0-9]+$',
+                     pattern_message='Only numeric characters are allowed.'),
+}
+EMPLOYEE_FIELDS = tuple(EMPLOYEE_RULES)
+
+
+class BatchValidator:
+    """
+        Description: Validates row tuples laid out in field_names order.
+                    Fields without a rule (such as email) are not checked.
+    """
+
+    def __init__(self, field_names, rules:dict = EMPLOYEE_RULES) -> None:
+        self.field_names = tuple(field_names)
+        self._columns = [(index, name, rules[name])
+                         for index, name in enumerate(self.field_names)
+                         if name in rules]
+
+    def __call__(self, rows:list) -> dict:
+        """
+            Description: Checks a batch of rows column by column.
+            Param: rows - sequence of tuples in field_names order
+            Return: Dict of row position -> list of 'field: message'
+                    errors; valid rows are absent
+        """
+        errors = {}
+        for index, name, rule in self._columns:
+            check = rule.check
+            for position, row in enumerate(rows):
+                message = check(row[index])
+                if message is not None:
+                    errors.setdefault(position, []).append(f'{name}: {message}')
+        return errors
+
+
+def validate_records(records:list, rules:dict = EMPLOYEE_RULES) -> tuple:
+    """
+        Description: Validates dicts (for example a JSON payload) against
+                    every rule, so missing fields count as errors.
+        Param: records - list of dicts keyed by field name
+        Param: rules - field rules (Default: EMPLOYEE_RULES)
+        Return: (rows, errors) where rows are tuples in rule order and
+                errors maps row position to its messages
+    """
+    fields = tuple(rules)
+    rows = [tuple(as_text(record.get(field)) if isinstance(record, dict) else None
+                  for field in fields) for record in records]
+    return rows, BatchValidator(fields, rules)(rows)
+
+def as_text(value) -> str | None:
+    # JSON numbers such as an ext of 1234 are checked as text
+    return value if value is None or isinstance(value, str) else str(value)
@@ -0,0 +1,80 @@
+"""
+Program: Bench_csv_reader.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Benchmarks reading an employee CSV file with the memory-
+             mapped reader used by imports, against csv.DictReader (the
+             original import path) and plain csv.reader. Reports rows
+             read per second.
+
+
+Revisions:
+
+"""
+
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+from app.csv_reader import MappedCSVReader
+
+
+def dict_reader_rows(path:str) -> int:
+    with open(path, newline='', encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+def csv_reader_rows(path:str) -> int:
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = csv.reader(file)
+        next(rows)
+        return sum(1 for _ in rows)
+
+def mapped_reader_rows(path:str) -> int:
+    with MappedCSVReader(path) as reader:
+        return sum(len(rows) for _, _, rows in reader.iter_chunks())
+
+def write_csv(path:str, rows:int, quoted:int) -> None:
+    """
+        Description: Writes an employee CSV file.
+        Param: path - output file
+        Param: rows - data rows
+        Param: quoted - every quoted-th row has a quoted field (0 for none)
+        Return: None
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        file.write('fname,lname,dept,ext,email\n')
+        for i in range(rows):
+            lname = '"Lee, Jr."' if quoted and i % quoted == 0 else f'Last{i % 997}'
+            file.write(f'First{i},{lname},IT,{i % 10000:04d},first{i}@abnor.com\n')
+
+def bench(read, path:str, repeat:int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = read(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return rows / best
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV reader benchmark')
+    parser.add_argument('--rows', type=int, default=1000000, help='data rows in the file')
+    parser.add_argument('--quoted', type=int, default=0,
+                        help='put a quoted field in every Nth row (default: none)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'employees.csv')
+        write_csv(path, args.rows, args.quoted)
+        print(f"{'':<18} {'rows/s':>12}")
+        for name, read in (('csv.DictReader', dict_reader_rows),
+                           ('csv.reader', csv_reader_rows),
+                           ('MappedCSVReader', mapped_reader_rows)):
+            print(f'{name:<18} {bench(read, path, args.repeat):>12,.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Program: Bench_listing.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Benchmarks rendering the employee listing from full ORM
+             instances against the column projection path used by
+             pages.index. Reports rows rendered per second.
+
+
+Revisions:
+
+"""
+
+
+import argparse
+import time
+from flask import render_template
+from app import create_app
+from app.extensions import db
+from app.models import Employee
+from app.queries import listing_query
+
+
+def orm_rows(page_size:int) -> list:
+    return Employee.query.order_by(Employee.lname, Employee.id).limit(page_size).all()
+
+def projected_rows(page_size:int) -> list:
+    return db.session.execute(listing_query().limit(page_size)).all()
+
+def bench(fetch, page_size:int, repeat:int, render:bool = True) -> float:
+    """
+        Description: Fetches (and renders) one listing page repeatedly.
+        Param: fetch - function returning the page's rows
+        Param: page_size - rows per page
+        Param: repeat - number of pages
+        Param: render - render index.html as well (Default: True)
+        Return: Rows per second
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        emps = fetch(page_size)
+        if render:
+            render_template('index.html', head_title='Home', page_title='Employees',
+                            emps=emps, current_page=1, total_pages=1)
+        # End the request as pages.index would (clears the identity map)
+        db.session.remove()
+    return page_size * repeat / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Listing render benchmark')
+    parser.add_argument('--rows', type=int, default=20000, help='employees in the table')
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(database_uri='sqlite:///:memory:')
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Employee), [
+            {'fname': f'First{i}', 'lname': f'Last{i % 997}', 'dept': 'IT',
+             'ext': f'{i % 10000:04d}', 'email': f'first{i}@abnor.com'}
+            for i in range(args.rows)])
+        db.session.commit()
+
+    with app.test_request_context('/'):
+        print(f"{'':<18} {'fetch rows/s':>14} {'rendered rows/s':>16}")
+        for name, fetch in (('ORM instances', orm_rows), ('Column projection', projected_rows)):
+            bench(fetch, args.page_size, 2)  # warm up
+            fetched = bench(fetch, args.page_size, args.repeat, render=False)
+            rendered = bench(fetch, args.page_size, args.repeat)
+            print(f'{name:<18} {fetched:>14,.0f} {rendered:>16,.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Program: Bench_sharding.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Benchmarks concurrent single-employee inserts (as done by
+             pages.add_emp: row, change log entry, commit) from several
+             worker processes, on one database against department
+             shards. A sharded insert commits once on its shard and
+             once on the main database (change log and locator), so
+             writes never get faster than that file takes short
+             commits. Reports writes per second.
+
+
+Revisions:
+
+"""
+
+
+import argparse
+import os
+import tempfile
+import time
+from multiprocessing import Process
+from app import create_app, sharding
+from app.changes import OP_INSERT, record_change
+from app.extensions import db
+from app.models import Employee
+
+DEPTS = ('HR', 'IT', 'ENG', 'MAN', 'SAL')
+
+
+def writer(database_uri:str, shard_uris:dict, worker:int, count:int) -> None:
+    app = create_app(database_uri=database_uri, shard_uris=shard_uris)
+    for n in range(count):
+        with app.app_context():
+            emp = Employee(fname=f'First{worker}', lname=f'Last{n}', dept=DEPTS[n % len(DEPTS)],
+                           ext='1234', email=f'first{worker}_{n}@abnor.com')
+            if sharding.sharding_enabled():
+                sharding.add_employee(emp)
+            else:
+                db.session.add(emp)
+            record_change(OP_INSERT, emp)
+            db.session.commit()
+
+def bench(folder:str, shards:int, writers:int, count:int) -> float:
+    """
+        Description: Runs `writers` processes of `count` inserts each.
+        Param: folder - folder for the database files
+        Param: shards - shard databases (0 for no sharding)
+        Param: writers - concurrent writer processes
+        Param: count - inserts per writer
+        Return: Writes per second
+    """
+    name = f'shards{shards}'
+    shard_uris = {dept: f"sqlite:///{os.path.join(folder, f'{name}_{n % shards}.db')}"
+                  for n, dept in enumerate(DEPTS)} if shards else None
+    database_uri = f"sqlite:///{os.path.join(folder, f'{name}_main.db')}"
+    app = create_app(database_uri=database_uri, shard_uris=shard_uris)
+    with app.app_context():
+        db.create_all()
+        sharding.create_all()
+
+    workers = [Process(target=writer, args=(database_uri, shard_uris, worker, count))
+               for worker in range(writers)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return writers * count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded write benchmark')
+    parser.add_argument('--writers', type=int, default=4, help='concurrent writer processes')
+    parser.add_argument('--count', type=int, default=250, help='inserts per writer')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'':<12} {'writes/s':>10}")
+        for shards in (0, 1, 2, 5):
+            label = f'{shards} shards' if shards else 'no sharding'
+            print(f'{label:<12} {bench(folder, shards, args.writers, args.count):>10,.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -15,14 +15,27 @@ Revisions:
 """
 
 
-import csv
+import argparse
 import os
 import platform
 import sys
+import time
 from app import create_app
+from app.exporter import EXPORT_FORMATS, export_stream
 from app.extensions import db
-from app.models import Employee
-from sqlalchemy import inspect
+from app.importer import (DEFAULT_CHUNK_BYTES,
+                          import_csv,
+                          resumable_checkpoint)
+from app.jobs import (cancel_job,
+                      get_job_runner,
+                      job_status,
+                      RUNNING,
+                      submit_job)
+from app.migrations import migrate, migration_status, stamp
+from app.models import Employee, Job
+from app import sharding
+from app.static_assets import build_manifest
+from sqlalchemy import inspect, select
 
 from rich.console import Console
 from rich.layout import Layout
@@ -83,11 +96,19 @@ def create_db(layout:Layout) -> None:
     """
     try:
         with app.app_context():
+            # Only a database built from the models now is up to date;
+            # existing tables are brought up to date by migrate
+            new = not inspect(db.engine).has_table(Employee.__tablename__)
             db.create_all()
+            sharding.create_all()
+            if new:
+                stamp()
         display_message_panel(
             layout, 
             OPT_1_TITLE, 
-            "[green]✅ Database created successfully.[/green]"
+            "[green]✅ Database created successfully.[/green]" if new else
+            "[green]✅ Missing tables created.[/green]\n"
+            "[yellow]Run 'manage_db.py migrate' to update the existing ones.[/yellow]"
         )
     except Exception as e:
         db.session.rollback()
@@ -105,6 +126,7 @@ def drop_db(layout) -> None:
     try:
         with app.app_context():
             db.drop_all()
+            sharding.drop_all()
         display_message_panel(
             layout, 
             OPT_2_TITLE, 
@@ -198,31 +220,49 @@ def populate_table(layout:Layout) -> None:
             )
             return display_main_menu(layout)
 
+        resume = False
+        checkpoint = resumable_checkpoint(csv_file, ModelClass)
+        if checkpoint and checkpoint.row_count:
+            resume = display_confirm_panel(
+                layout,
+                OPT_3_TITLE,
+                f"Resume previous import after row {checkpoint.row_count}?\n"
+                f"No starts again from the top and imports those {checkpoint.row_count} "
+                f"rows a second time."
+            )
+
         try:
-            with open(csv_file, newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    try:
-                        data = {field: row[field] for field in field_names}
-                        record = ModelClass(**data)
-                        db.session.add(record)
-                    except Exception as e:
-                        # Skip error rows but continue processing
-                        continue
-                db.session.commit()
+            result = import_csv(csv_file, ModelClass, field_names, resume=resume)
             display_message_panel(
                 layout,
                 OPT_3_TITLE, 
-                f"[green]✅ Table '[/green]{table_class}[green]' populated successfully.[/green]"
+                f"[green]✅ Table '[/green]{table_class}[green]' populated successfully "
+                f"({result.rows - result.resumed_from} rows read).[/green]"
+                + rejected_summary(result)
             )
         except Exception as e:
             db.session.rollback()
             display_message_panel(
                 layout, 
                 OPT_3_TITLE, 
-                f"[bold red]An error occurred during population:[/bold red]\n[red]{e}[/red]"
+                f"[bold red]An error occurred during population:[/bold red]\n[red]{e}[/red]\n"
+                f"[yellow]Committed chunks are kept; choose resume to continue.[/yellow]"
             )
 
+def rejected_summary(result, limit:int = 5) -> str:
+    """
+        Description: Formats the rows skipped by validation.
+        Param: result - ImportResult from import_csv
+        Param: limit - rejected rows to list (Default: 5)
+        Return: Rich markup string (empty if nothing was rejected)
+    """
+    if not result.rejected:
+        return ''
+    lines = [f"\n[yellow]{result.rejected} rows rejected by validation:[/yellow]"]
+    lines += [f"[red]Row {row}: {'; '.join(messages)}[/red]"
+              for row, messages in result.errors[:limit]]
+    return '\n'.join(lines)
+
 def reset_db(layout:Layout) -> None:
     """
         Description: Drops and recreates database tables.
@@ -232,7 +272,10 @@ def reset_db(layout:Layout) -> None:
     try:
         with app.app_context():
             db.drop_all()
+            sharding.drop_all()
             db.create_all()
+            sharding.create_all()
+            stamp()
         display_message_panel(
             layout, 
             OPT_4_TITLE, 
@@ -427,7 +470,252 @@ def display_confirm_panel(layout:Layout, title:str, prompt:str) -> bool:
     console.print(layout)
     return Confirm.ask("[yellow]Confirm[/yellow]", default="y")
 
+def populate_command(args:argparse.Namespace) -> None:
+    """
+        Description: Non-interactive populate, suited to long
+                    unattended loads. With --resume it continues
+                    from the last committed chunk.
+        Param: args - parsed command line arguments
+        Return: None
+    """
+    if not validate_table_class(args.table_class):
+        console.print(f"[bold red]Table '{args.table_class}' not found in the database.[/bold red]")
+        sys.exit(1)
+    if not validate_field_names(args.table_class, args.fields):
+        console.print(f"[bold red]Invalid field names for table '{args.table_class}'.[/bold red]")
+        sys.exit(1)
+    ModelClass = globals().get(args.table_class)
+    if not ModelClass:
+        console.print(f"[bold red]Table class '{args.table_class}' not found.[/bold red]")
+        sys.exit(1)
+
+    if args.background:
+        return queue_job('import', {'csv_file': args.csv_file, 'table': args.table_class,
+                                    'fields': args.fields, 'resume': args.resume,
+                                    'chunk_bytes': args.chunk_bytes})
+    with app.app_context():
+        try:
+            result = import_csv(args.csv_file, ModelClass, args.fields,
+                                resume=args.resume, chunk_bytes=args.chunk_bytes)
+        except Exception as e:
+            console.print(f"[bold red]An error occurred during population:[/bold red]\n[red]{e}[/red]")
+            sys.exit(1)
+    if result.resumed_from:
+        console.print(f"[cyan]Resumed after row {result.resumed_from}.[/cyan]")
+    console.print(f"[green]✅ {result.rows} rows read into '{args.table_class}'.[/green]"
+                  + rejected_summary(result, limit=len(result.errors)))
+
+def export_command(args:argparse.Namespace) -> None:
+    """
+        Description: Streams the employee table to a file or stdout.
+        Param: args - parsed command line arguments
+        Return: None
+    """
+    if args.background:
+        return queue_job('export', {'format': args.format, 'depts': args.dept, 'gzip': args.gzip,
+                                    'output': None if args.output == '-' else args.output})
+    with app.app_context():
+        stream = export_stream(args.format, depts=args.dept, compress=args.gzip)
+        if args.output == '-':
+            for chunk in stream:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+        with open(args.output, 'wb') as file:
+            for chunk in stream:
+                file.write(chunk)
+    console.print(f"[green]✅ Employees exported to '{args.output}'.[/green]")
+
+def queue_job(kind:str, params:dict) -> None:
+    """
+        Description: Queues a background job for a runner to pick up
+                    (the web app's, or `jobs --run`).
+        Param: kind - 'import', 'export' or 'migrate'
+        Param: params - job parameters
+        Return: None
+    """
+    with app.app_context():
+        try:
+            job = submit_job(kind, params)
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
+            sys.exit(1)
+        console.print(f"[green]✅ Queued {kind} job {job.id}.[/green]")
+
+def job_line(status:dict) -> str:
+    line = f"{status['id']:>5}  {status['kind']:<7} {status['status']:<10} {status['rows_done']:>9} rows"
+    if status['status'] == 'running':
+        line += f"  {status['progress']:.0%}"
+        if status['rows_per_sec']:
+            line += f"  {status['rows_per_sec']:.0f} rows/s"
+        if status['eta_seconds'] is not None:
+            line += f"  ETA {status['eta_seconds']:.0f}s"
+    elif status['error']:
+        line += f"  {status['error']}"
+    return line
+
+def jobs_command(args:argparse.Namespace) -> None:
+    """
+        Description: Lists background jobs, cancels one, or runs the
+                    queued jobs in this process until none are left.
+        Param: args - parsed command line arguments
+        Return: None
+    """
+    with app.app_context():
+        if args.cancel is not None:
+            job = db.session.get(Job, args.cancel)
+            if job is None:
+                console.print(f"[bold red]Job {args.cancel} not found.[/bold red]")
+                sys.exit(1)
+            cancel_job(job)
+            console.print(job_line(job_status(job)))
+            return
+
+        if args.run:
+            runner = get_job_runner(start=False)
+            while runner.dispatch() or runner.active:
+                time.sleep(app.config['JOB_PROGRESS_INTERVAL'])
+                db.session.rollback()
+                for job in db.session.scalars(select(Job).where(Job.status == RUNNING)):
+                    console.print(job_line(job_status(job)))
+            runner.stop()
+
+        for job in db.session.scalars(select(Job).order_by(Job.id.desc()).limit(args.limit)):
+            console.print(job_line(job_status(job)))
+
+def migrate_command(args:argparse.Namespace) -> None:
+    """
+        Description: Shows migration status, stamps a new database, or
+                    applies pending migrations online with backfill
+                    progress.
+        Param: args - parsed command line arguments
+        Return: None
+    """
+    if args.background:
+        return queue_job('migrate', {'target': args.to, 'batch_size': args.batch_size,
+                                     'pause': args.pause})
+    with app.app_context():
+        if args.stamp:
+            stamp()
+        elif not args.status:
+            started = time.monotonic()
+            last = 0.0
+
+            def progress(rows, fraction):
+                nonlocal last
+                now = time.monotonic()
+                if rows and (now - last >= 1.0 or fraction >= 1.0):
+                    last = now
+                    rate = rows / (now - started) if now > started else 0
+                    console.print(f"[cyan]{rows} rows backfilled ({fraction:.0%}, "
+                                  f"{rate:.0f} rows/s)[/cyan]")
+
+            try:
+                applied, _ = migrate(args.to, args.batch_size, args.pause, progress=progress)
+            except Exception as e:
+                console.print(f"[bold red]Migration failed:[/bold red]\n[red]{e}[/red]")
+                sys.exit(1)
+            console.print(f"[green]✅ {len(applied)} migrations applied.[/green]")
+        for status in migration_status():
+            console.print(f"{status['version']:>4}  {status['status']:<8} {status['name']}")
+
+def move_to_shards_command(args:argparse.Namespace) -> None:
+    """
+        Description: Moves employee rows written before sharding was
+                    turned on from the main database into their shards.
+        Param: args - parsed command line arguments
+        Return: None
+    """
+    with app.app_context():
+        if not sharding.sharding_enabled():
+            console.print("[bold red]Sharding is off; set SHARD_URIS first.[/bold red]")
+            sys.exit(1)
+        sharding.create_all()
+        try:
+            moved = sharding.move_to_shards(args.batch_size)
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
+            sys.exit(1)
+    console.print(f"[green]✅ {moved} employees moved to their shards.[/green]")
+
+def build_static_command(args:argparse.Namespace) -> None:
+    """
+        Description: Fingerprints the static files so they can be
+                    cached as immutable.
+        Param: args - parsed command line arguments
+        Return: None
+    """
+    if not app.static_folder or not os.path.isdir(app.static_folder):
+        console.print(f"[yellow]No static folder at '{app.static_folder}'.[/yellow]")
+        return
+    manifest = build_manifest(app.static_folder)
+    console.print(f"[green]✅ {len(manifest)} static files fingerprinted.[/green]")
+
+def parse_args(argv:list = None) -> argparse.Namespace:
+    """
+        Description: Parses command line arguments. With no
+                    command the interactive menu is shown.
+        Param: argv - argument list (Default: sys.argv)
+        Return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=APP_TITLE)
+    commands = parser.add_subparsers(dest='command')
+
+    populate = commands.add_parser('populate', help='populate a table from a CSV file')
+    populate.add_argument('csv_file')
+    populate.add_argument('table_class')
+    populate.add_argument('fields', nargs='+')
+    populate.add_argument('--resume', action='store_true',
+                          help='continue from the last committed chunk')
+    populate.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES,
+                          help='approximate chunk size committed at a time')
+    populate.add_argument('--background', action='store_true',
+                          help='queue as a background job instead of running now')
+
+    export = commands.add_parser('export', help='stream the employee table to a file')
+    export.add_argument('-o', '--output', default='-',
+                        help="output file ('-' for stdout)")
+    export.add_argument('-f', '--format', choices=sorted(EXPORT_FORMATS), default='csv')
+    export.add_argument('-d', '--dept', action='append',
+                        help='only export this department (repeatable)')
+    export.add_argument('--gzip', action='store_true', help='gzip the output')
+    export.add_argument('--background', action='store_true',
+                        help='queue as a background job instead of running now')
+
+    jobs = commands.add_parser('jobs', help='list, cancel or run background jobs')
+    jobs.add_argument('--cancel', type=int, metavar='ID', help='cancel a job')
+    jobs.add_argument('--run', action='store_true',
+                      help='run queued jobs in this process until the queue is empty')
+    jobs.add_argument('--limit', type=int, default=20, help='jobs to list')
+
+    migrate_parser = commands.add_parser('migrate', help='apply schema migrations online')
+    migrate_parser.add_argument('--to', type=int, metavar='VERSION',
+                                help='last version to apply (default: all)')
+    migrate_parser.add_argument('--batch-size', type=int, help='backfill rows per batch')
+    migrate_parser.add_argument('--pause', type=float, help='seconds to pause between batches')
+    migrate_parser.add_argument('--status', action='store_true', help='only show versions')
+    migrate_parser.add_argument('--stamp', action='store_true',
+                                help='mark all migrations applied (new databases)')
+    migrate_parser.add_argument('--background', action='store_true',
+                                help='queue as a background job instead of running now')
+
+    shards = commands.add_parser('move-to-shards',
+                                 help='move existing employees into their department shards')
+    shards.add_argument('--batch-size', type=int, default=1000, help='rows moved per batch')
+
+    commands.add_parser('build-static', help='fingerprint static files for long-lived caching')
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    match args.command:
+        case 'populate': return populate_command(args)
+        case 'export': return export_command(args)
+        case 'jobs': return jobs_command(args)
+        case 'migrate': return migrate_command(args)
+        case 'move-to-shards': return move_to_shards_command(args)
+        case 'build-static': return build_static_command(args)
+
     while True:
         display_main_menu()
 
@@ -13,7 +13,7 @@ Revisions:
 import pytest
 
 from app import create_app, db
-from app.models import Employee
+from app.models import Employee, EmployeeChange, Job
 
 @pytest.fixture(scope='session')
 def app():
@@ -21,6 +21,8 @@ def app():
     app = create_app(database_uri='sqlite:///:memory:')
     # Disable CSRF for form submissions
     app.config['WTF_CSRF_ENABLED'] = False
+    # Jobs are run explicitly by the tests
+    app.config['JOB_AUTOSTART'] = False
     with app.app_context():
         db.create_all()
     yield app
@@ -34,6 +36,8 @@ def populate_db(app):
     with app.app_context():
         # Per-Test Cleanup
         db.session.query(Employee).delete()
+        db.session.query(EmployeeChange).delete()
+        db.session.query(Job).delete()
         
         # Create sample employees (Maya must be the first employee)
         employees = [
@@ -0,0 +1,61 @@
+"""
+Program: Test_admission.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for write admission control
+
+
+Revisions:
+
+"""
+
+
+import threading
+from app.admission import WriteLimiter
+
+
+def test_limiter_rejects_when_queue_full():
+    limiter = WriteLimiter(concurrency=1, queue=0, timeout=1)
+    assert limiter.acquire()
+    assert not limiter.acquire()
+    limiter.release()
+    assert limiter.acquire()
+    assert limiter.stats()['rejected'] == 1
+
+def test_limiter_queue_times_out():
+    limiter = WriteLimiter(concurrency=1, queue=1, timeout=0.05)
+    assert limiter.acquire()
+    assert not limiter.acquire()
+    assert limiter.stats()['timed_out'] == 1
+
+def test_limiter_hands_slot_to_waiter():
+    limiter = WriteLimiter(concurrency=1, queue=1, timeout=5)
+    assert limiter.acquire()
+    admitted = []
+    waiter = threading.Thread(target=lambda: admitted.append(limiter.acquire()))
+    waiter.start()
+    while limiter.stats()['waiting'] == 0:
+        pass
+    limiter.release()
+    waiter.join()
+    assert admitted == [True]
+    assert limiter.stats()['active'] == 1
+
+def test_write_endpoint_sheds_load(client, app):
+    app.config['WRITE_LIMITS']['pages.delete_emp'] = {'concurrency': 0, 'queue': 0,
+                                                      'retry_after': 7}
+    app.extensions.get('write_limiters', {}).pop('pages.delete_emp', None)
+    try:
+        response = client.post('/delete_emp/1/')
+        metrics = client.get('/api/metrics/').get_json()
+    finally:
+        del app.config['WRITE_LIMITS']['pages.delete_emp']
+        app.extensions['write_limiters'].pop('pages.delete_emp')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+    assert metrics['write_limiters']['pages.delete_emp']['rejected'] == 1
+
+    # Reads are never limited
+    assert client.get('/add_emp/').status_code == 200
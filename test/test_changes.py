@@ -0,0 +1,90 @@
+"""
+Program: Test_changes.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for the employee change feed
+
+
+Revisions:
+
+"""
+
+
+import json
+from app.changes import current_seq
+from app.extensions import db
+from app.importer import import_csv
+from app.models import Employee
+
+
+def test_writes_are_logged_in_order(client):
+    client.post('/add_emp/', data={'fname': 'Megan', 'lname': 'Wolfgrill',
+                                   'dept': 'IT', 'ext': '3999'})
+    client.post('/update_emp/2/', data={'fname': 'Gil', 'lname': 'Flangeworm',
+                                        'dept': 'HR', 'ext': '4321'})
+    client.post('/delete_emp/1/')
+
+    response = client.get('/api/changes/?since=0')
+    assert response.status_code == 200
+    feed = response.get_json()
+
+    changes = feed['changes']
+    assert [change['op'] for change in changes] == ['insert', 'update', 'delete']
+    assert changes[0]['data']['email'] == 'megan_wolfgrill@abnor.com'
+    assert changes[1]['emp_id'] == 2 and changes[1]['data']['ext'] == '4321'
+    assert changes[2]['emp_id'] == 1
+    assert feed['last_seq'] == changes[-1]['seq']
+
+    response = client.get(f"/api/changes/?since={feed['last_seq']}")
+    assert response.get_json() == {'changes': [], 'last_seq': feed['last_seq']}
+
+def test_negative_limit_returns_one_change(client):
+    client.post('/delete_emp/1/')
+    client.post('/delete_emp/2/')
+    assert len(client.get('/api/changes/?since=0&limit=-1').get_json()['changes']) == 1
+
+def test_failed_write_logs_nothing(client, app, monkeypatch):
+    # A failed commit must roll back the change with the employee row
+    def failing_commit():
+        raise OSError('disk full')
+
+    with app.app_context():
+        monkeypatch.setattr(db.session, 'commit', failing_commit)
+        response = client.post('/add_emp/', data={'fname': 'Megan', 'lname': 'Wolfgrill',
+                                                  'dept': 'IT', 'ext': '3999'})
+        monkeypatch.undo()
+        assert b'Database error' in response.data
+        assert current_seq() == 0
+        assert Employee.query.filter_by(lname='Wolfgrill').first() is None
+
+def test_long_poll_times_out_empty(client):
+    response = client.get('/api/changes/?since=0&wait=0.1')
+    assert response.get_json()['changes'] == []
+
+def test_stream_sends_change_events(client, app):
+    client.post('/delete_emp/3/')
+    app.config['CHANGE_STREAM_TIMEOUT'] = 0.2
+    app.config['CHANGE_STREAM_KEEPALIVE'] = 0.1
+    try:
+        response = client.get('/api/changes/stream/', headers={'Last-Event-ID': '0'})
+        body = response.get_data(as_text=True)
+    finally:
+        app.config['CHANGE_STREAM_TIMEOUT'] = 300
+        app.config['CHANGE_STREAM_KEEPALIVE'] = 15
+
+    assert response.mimetype == 'text/event-stream'
+    event = body.split('event: change\ndata: ')[1].split('\n\n')[0]
+    assert json.loads(event)['emp_id'] == 3
+
+def test_import_logs_inserts(app, tmp_path):
+    csv_file = tmp_path / 'load.csv'
+    csv_file.write_text('fname,lname,dept,ext,email\n'
+                        'Megan,Wolfgrill,IT,3999,megan_wolfgrill@abnor.com\n')
+
+    with app.app_context():
+        import_csv(str(csv_file), Employee, ['fname', 'lname', 'dept', 'ext', 'email'])
+        emp = Employee.query.filter_by(email='megan_wolfgrill@abnor.com').first()
+
+    changes = app.test_client().get('/api/changes/').get_json()['changes']
+    assert [(change['op'], change['emp_id']) for change in changes] == [('insert', emp.id)]
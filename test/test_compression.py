@@ -0,0 +1,74 @@
+"""
+Program: Test_compression.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for response compression and fingerprinted
+             static files
+
+
+Revisions:
+
+"""
+
+
+import gzip
+from flask import url_for
+from app import create_app
+from app.static_assets import build_manifest, refresh_manifest
+
+
+def test_html_is_gzipped_when_accepted(client):
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'Employees' in gzip.decompress(response.data)
+
+def test_no_compression_without_accept_encoding(client):
+    response = client.get('/')
+    assert 'Content-Encoding' not in response.headers
+    assert b'Employees' in response.data
+
+def test_small_and_streamed_responses_are_not_compressed(client, app):
+    response = client.get('/api/employees/1/', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+    response = client.get('/export/csv/', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+def test_streamed_listing_is_gzipped_incrementally(client):
+    response = client.get('/?per_page=500', headers={'Accept-Encoding': 'gzip'})
+    assert response.is_streamed
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    html = gzip.decompress(response.data)
+    assert b'Flangeworm' in html and b'</html>' in html
+
+def test_static_files_are_fingerprinted(tmp_path):
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'site.css').write_text('body { margin: 0; }')
+
+    app = create_app(database_uri='sqlite:///:memory:')
+    app.static_folder = str(tmp_path)
+    manifest = build_manifest(str(tmp_path))
+    refresh_manifest(app)
+
+    hashed = manifest['css/site.css']
+    assert hashed.startswith('css/site.') and hashed.endswith('.css')
+    with app.test_request_context():
+        assert url_for('static', filename='css/site.css') == f'/static/{hashed}'
+
+    client = app.test_client()
+    response = client.get(f'/static/{hashed}')
+    assert response.data == b'body { margin: 0; }'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    response.close()
+
+    response = client.get('/static/css/site.css')
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+    response.close()
+
+    # Rebuilding after a change replaces the stale copy
+    (tmp_path / 'css' / 'site.css').write_text('body { margin: 1px; }')
+    assert build_manifest(str(tmp_path))['css/site.css'] != hashed
+    assert not (tmp_path / hashed).exists()
@@ -0,0 +1,93 @@
+"""
+Program: Test_csv_reader.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for the memory-mapped CSV reader
+
+
+Revisions:
+
+"""
+
+
+import pytest
+from app.csv_reader import MappedCSVReader
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / 'employees.csv'
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+def test_reader_yields_tuples_in_header_order(tmp_path):
+    path = write_csv(tmp_path, 'fname,lname,dept,ext,email\n'
+                               'Maya,Name,IT,3234,maya_name@adnor.com\n'
+                               'Gil,Flangeworm,HR,1234,gil_flangeworm@abnor.com\n')
+
+    with MappedCSVReader(path) as reader:
+        assert reader.header == ('fname', 'lname', 'dept', 'ext', 'email')
+        rows = list(reader)
+
+    assert rows == [('Maya', 'Name', 'IT', '3234', 'maya_name@adnor.com'),
+                    ('Gil', 'Flangeworm', 'HR', '1234', 'gil_flangeworm@abnor.com')]
+
+def test_reader_handles_quotes_crlf_and_blank_lines(tmp_path):
+    path = write_csv(tmp_path, '\ufefffname,lname\r\n'
+                               '"Name, Jr.",Maya\r\n'
+                               '\r\n'
+                               '"Multi\nLine",Gil\r\n'
+                               'Wil,Manglefrog')
+
+    with MappedCSVReader(path) as reader:
+        assert reader.header == ('fname', 'lname')
+        rows = list(reader)
+
+    assert rows == [('Name, Jr.', 'Maya'), ('Multi\nLine', 'Gil'), ('Wil', 'Manglefrog')]
+
+def test_reader_stray_quote_in_unquoted_field(tmp_path):
+    path = write_csv(tmp_path, 'fname,lname\n'
+                               'Shaq,O"Neal\n'
+                               'Maya,"Na""me"\n'
+                               'Gil,Flangeworm\n')
+
+    with MappedCSVReader(path) as reader:
+        rows = list(reader)
+
+    assert rows == [('Shaq', 'O"Neal'), ('Maya', 'Na"me'), ('Gil', 'Flangeworm')]
+
+def test_reader_chunks_resume_from_byte_offset(tmp_path):
+    lines = ''.join(f'Emp{i},Last{i},IT,{i:04d}\n' for i in range(50))
+    path = write_csv(tmp_path, 'fname,lname,dept,ext\n' + lines)
+
+    with MappedCSVReader(path) as reader:
+        chunks = list(reader.iter_chunks(chunk_bytes=64))
+        assert len(chunks) > 1
+        assert chunks[0][0] == reader.data_offset
+        assert chunks[-1][1] == reader.size
+        for (_, end, _), (start, _, _) in zip(chunks, chunks[1:]):
+            assert end == start
+
+        resumed = [row for _, _, rows in reader.iter_chunks(64, start=chunks[2][0])
+                   for row in rows]
+
+    all_rows = [row for _, _, rows in chunks for row in rows]
+    assert len(all_rows) == 50
+    assert resumed == all_rows[-len(resumed):]
+
+def test_reader_getter_projects_fields(tmp_path):
+    path = write_csv(tmp_path, 'fname,lname,dept,ext\nMaya,Name,IT,3234\n')
+
+    with MappedCSVReader(path) as reader:
+        get_fields = reader.getter(['ext', 'fname'])
+        assert [get_fields(row) for row in reader] == [('3234', 'Maya')]
+        assert reader.getter(['dept'])(('Maya', 'Name', 'IT', '3234')) == ('IT',)
+        with pytest.raises(KeyError):
+            reader.getter(['email'])
+
+def test_reader_empty_file(tmp_path):
+    path = write_csv(tmp_path, '')
+
+    with MappedCSVReader(path) as reader:
+        assert reader.header == ()
+        assert list(reader) == []
@@ -0,0 +1,126 @@
+"""
+Program: Test_directory.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for the in-memory directory snapshot
+
+
+Revisions:
+
+"""
+
+
+import sys
+import threading
+import pytest
+from bs4 import BeautifulSoup
+from app.directory import DirectorySnapshot
+
+
+@pytest.fixture
+def snapshot_app(app):
+    """Enable the snapshot, rebuilt from scratch for each test."""
+    app.config['DIRECTORY_SNAPSHOT'] = True
+    app.config['DIRECTORY_REFRESH_INTERVAL'] = 0
+    app.extensions.pop('directory', None)
+    yield app
+    app.config['DIRECTORY_SNAPSHOT'] = False
+    app.config['DIRECTORY_REFRESH_INTERVAL'] = 1.0
+    app.extensions.pop('directory', None)
+
+def test_snapshot_indexes(app):
+    snapshot = DirectorySnapshot()
+    with app.app_context():
+        snapshot.load()
+
+    assert len(snapshot) == 3
+    assert snapshot.get(2).lname == 'Flangeworm'
+    assert snapshot.by_email('maya_name@adnor.com').id == 1
+    assert [record.id for record in snapshot.by_ext('2234')] == [3]
+    assert [record.lname for record in snapshot.listing()] == ['Flangeworm', 'Manglefrog', 'Name']
+    assert [record.id for record in snapshot.listing(1, 1)] == [3]
+    assert snapshot.memory_usage() > 0
+
+def test_reads_survive_concurrent_changes(app):
+    snapshot = DirectorySnapshot()
+    with app.app_context():
+        snapshot.load()
+    data = {'fname': 'Temp', 'lname': 'Flangeworm', 'dept': 'IT', 'ext': '1234'}
+    stop = threading.Event()
+    errors = []
+
+    def write():
+        for emp_id in range(100, 3100):
+            snapshot._apply({'emp_id': emp_id, 'op': 'insert',
+                             'data': dict(data, id=emp_id, email=f'temp{emp_id}@abnor.com')})
+            snapshot._apply({'emp_id': emp_id, 'op': 'delete', 'data': None})
+        stop.set()
+
+    def read():
+        try:
+            while not stop.is_set():
+                snapshot.by_ext('1234')
+                snapshot.listing(0, 3)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    # Switch threads often so reads land in the middle of changes
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert [record.id for record in snapshot.by_ext('1234')] == [2]
+    assert len(snapshot.listing()) == 3
+
+def test_snapshot_applies_changes(snapshot_app):
+    client = snapshot_app.test_client()
+    assert client.get('/api/directory/').get_json()['records'] == 3
+
+    client.post('/add_emp/', data={'fname': 'Megan', 'lname': 'Abbot',
+                                   'dept': 'IT', 'ext': '3999'})
+    client.post('/update_emp/2/', data={'fname': 'Gil', 'lname': 'Zed',
+                                        'dept': 'HR', 'ext': '2234'})
+    client.post('/delete_emp/1/')
+
+    with snapshot_app.app_context():
+        snapshot = snapshot_app.extensions['directory']
+        snapshot.refresh()
+
+    assert [record.lname for record in snapshot.listing()] == ['Abbot', 'Manglefrog', 'Zed']
+    assert snapshot.get(1) is None
+    assert snapshot.by_email('maya_name@adnor.com') is None
+    assert sorted(record.id for record in snapshot.by_ext('2234')) == [2, 3]
+
+    stats = client.get('/api/directory/').get_json()
+    assert stats['records'] == 3
+    assert stats['seq'] == snapshot.seq
+
+def test_lookup_endpoints_match_with_and_without_snapshot(app, snapshot_app):
+    urls = ['/api/employees/2/', '/api/employees/?email=gil_flangeworm@abnor.com',
+            '/api/employees/?ext=3234']
+    client = app.test_client()
+    from_snapshot = [client.get(url).get_json() for url in urls]
+
+    app.config['DIRECTORY_SNAPSHOT'] = False
+    from_database = [client.get(url).get_json() for url in urls]
+
+    assert from_snapshot == from_database
+    assert from_database[0]['email'] == 'gil_flangeworm@abnor.com'
+    assert client.get('/api/employees/99/').status_code == 404
+
+def test_index_lists_from_snapshot(snapshot_app):
+    response = snapshot_app.test_client().get('/')
+    soup = BeautifulSoup(response.data, 'html.parser')
+
+    first_names = [row.find('td').string for row in soup.find('tbody').find_all('tr')]
+    assert first_names == ['Gil', 'Wil', 'Maya']
+    assert 'Page 1 of 1' in soup.find('div', class_='pagination').get_text()
@@ -0,0 +1,68 @@
+"""
+Program: Test_emails.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for employee email allocation
+
+
+Revisions:
+
+"""
+
+
+from app.emails import allocate_email, allocate_emails
+from app.extensions import db
+from app.importer import import_csv
+from app.models import Employee
+
+
+def add_employee(email):
+    db.session.add(Employee(fname='Ann', lname='Lee', dept='IT', ext='1111', email=email))
+    db.session.commit()
+
+def test_allocate_email_finds_next_variant(app):
+    with app.app_context():
+        assert allocate_email('Ann', 'Lee') == 'ann_lee@abnor.com'
+        add_employee('ann_lee@abnor.com')
+        assert allocate_email('Ann', 'Lee') == 'ann_lee_2@abnor.com'
+        add_employee('ann_lee_2@abnor.com')
+        add_employee('ann_lee_x@abnor.com')
+        add_employee('ann_leeroy@abnor.com')
+        assert allocate_email('ANN', 'Lee') == 'ann_lee_3@abnor.com'
+
+def test_allocate_emails_avoids_clashes_in_batch(app):
+    with app.app_context():
+        emails = allocate_emails([('Gil', 'Flangeworm'), ('Ann', 'Lee'),
+                                  ('Gil', 'Flangeworm'), ('Ann', 'Lee'), ('Ann', 'Lee_2')])
+
+    assert emails == ['gil_flangeworm_2@abnor.com', 'ann_lee@abnor.com',
+                      'gil_flangeworm_3@abnor.com', 'ann_lee_2@abnor.com',
+                      'ann_lee_2_2@abnor.com']
+
+def test_add_duplicate_name_gets_variant(client, app):
+    response = client.post('/add_emp/', data={'fname': 'Gil', 'lname': 'Flangeworm',
+                                              'dept': 'HR', 'ext': '1234'},
+                           follow_redirects=True)
+    assert b'Gil Flangeworm added to database' in response.data
+
+    with app.app_context():
+        emails = {emp.email for emp in Employee.query.filter_by(lname='Flangeworm')}
+    assert emails == {'gil_flangeworm@abnor.com', 'gil_flangeworm_2@abnor.com'}
+
+def test_import_allocates_and_rejects_emails(app, tmp_path):
+    csv_file = tmp_path / 'load.csv'
+    csv_file.write_text('fname,lname,dept,ext,email\n'
+                        'Gil,Flangeworm,HR,1234,\n'
+                        'Wil,Manglefrog,SAL,2234,wil_manglefrogl@abnor.com\n'
+                        'Megan,Wolfgrill,IT,3999,megan@abnor.com\n'
+                        'Megan,Wolfgrill,IT,3999,megan@abnor.com\n')
+
+    with app.app_context():
+        result = import_csv(str(csv_file), Employee, ['fname', 'lname', 'dept', 'ext', 'email'])
+        assert Employee.query.filter_by(email='gil_flangeworm_2@abnor.com').first() is not None
+        assert Employee.query.filter_by(email='megan@abnor.com').count() == 1
+
+    assert result.rejected == 2
+    assert [row for row, _ in result.errors] == [2, 4]
+    assert result.errors[0][1] == ['email: Already in use.']
@@ -0,0 +1,55 @@
+"""
+Program: Test_exporter.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for the streaming employee export
+
+
+Revisions:
+
+"""
+
+
+import csv
+import gzip
+import io
+import json
+from app.exporter import export_stream, iter_batches
+
+
+def test_iter_batches_uses_id_order(app):
+    with app.app_context():
+        batches = list(iter_batches(batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [row.id for batch in batches for row in batch] == [1, 2, 3]
+
+def test_export_stream_gzip_round_trip(app):
+    with app.app_context():
+        data = b''.join(export_stream('jsonl', compress=True, batch_size=1))
+
+    records = [json.loads(line) for line in gzip.decompress(data).splitlines()]
+    assert [record['fname'] for record in records] == ['Maya', 'Gil', 'Wil']
+
+def test_export_csv_route(client):
+    response = client.get('/export/csv/')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'employees.csv' in response.headers['Content-Disposition']
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['id'] for row in rows] == ['1', '2', '3']
+    assert rows[1]['email'] == 'gil_flangeworm@abnor.com'
+
+def test_export_route_filters_by_dept(client):
+    response = client.get('/export/jsonl/?dept=HR&dept=IT&gzip=1')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/gzip'
+
+    records = [json.loads(line) for line in gzip.decompress(response.data).splitlines()]
+    assert sorted(record['dept'] for record in records) == ['HR', 'IT']
+
+def test_export_unknown_format(client):
+    response = client.get('/export/xml/')
+    assert response.status_code == 404
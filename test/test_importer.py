@@ -0,0 +1,81 @@
+"""
+Program: Test_importer.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for the chunked, resumable CSV importer
+
+
+Revisions:
+
+"""
+
+
+import pytest
+from app.csv_reader import MappedCSVReader
+from app.extensions import db
+from app.importer import get_checkpoint, import_csv, resumable_checkpoint
+from app.models import Employee
+
+FIELDS = ['fname', 'lname', 'dept', 'ext', 'email']
+
+
+def write_employees(tmp_path, count):
+    path = tmp_path / 'load.csv'
+    lines = ['fname,lname,dept,ext,email']
+    lines += [f'First{i},Last{i},IT,{i:04d},first{i}_last{i}@abnor.com' for i in range(count)]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+def test_import_csv_commits_all_chunks(app, tmp_path):
+    csv_file = write_employees(tmp_path, 40)
+
+    with app.app_context():
+        result = import_csv(csv_file, Employee, FIELDS, chunk_bytes=256)
+        assert result.rows == 40
+        assert result.resumed_from == 0
+        assert db.session.query(Employee).count() == 43
+
+        checkpoint = get_checkpoint(csv_file, Employee)
+        assert checkpoint.completed
+        assert checkpoint.byte_offset == result.byte_offset
+        assert resumable_checkpoint(csv_file, Employee) is None
+
+def test_import_csv_resumes_after_failure(app, tmp_path, monkeypatch):
+    csv_file = write_employees(tmp_path, 40)
+    iter_chunks = MappedCSVReader.iter_chunks
+
+    def failing_chunks(self, *args, **kwargs):
+        for number, chunk in enumerate(iter_chunks(self, *args, **kwargs)):
+            if number == 2:
+                raise OSError('disk full')
+            yield chunk
+
+    with app.app_context():
+        monkeypatch.setattr(MappedCSVReader, 'iter_chunks', failing_chunks)
+        with pytest.raises(OSError):
+            import_csv(csv_file, Employee, FIELDS, chunk_bytes=256)
+
+        checkpoint = resumable_checkpoint(csv_file, Employee)
+        assert checkpoint is not None
+        committed = checkpoint.row_count
+        assert 0 < committed < 40
+        assert db.session.query(Employee).count() == 3 + committed
+
+        monkeypatch.setattr(MappedCSVReader, 'iter_chunks', iter_chunks)
+        result = import_csv(csv_file, Employee, FIELDS, resume=True, chunk_bytes=256)
+        assert result.resumed_from == committed
+        assert result.rows == 40
+        assert db.session.query(Employee).count() == 43
+
+def test_import_rejects_row_with_missing_fields(app, tmp_path):
+    csv_file = tmp_path / 'short.csv'
+    csv_file.write_text('fname,lname,dept,ext,email\n'
+                        'Ann,Lee,IT,1111,ann_lee@abnor.com\n'
+                        'Bob,Short\n'
+                        'Cy,Ng,HR,2222,cy_ng@abnor.com\n')
+    with app.app_context():
+        result = import_csv(str(csv_file), Employee, FIELDS)
+        assert (result.rows, result.rejected) == (3, 1)
+        assert list(result.errors) == [(2, ['Wrong number of fields (2, expected 5)'])]
+        assert db.session.query(Employee).filter(Employee.lname.in_(['Lee', 'Ng'])).count() == 2
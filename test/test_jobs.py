@@ -0,0 +1,192 @@
+"""
+Program: Test_jobs.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for background import and export jobs
+
+
+Revisions:
+
+"""
+
+
+import time
+from datetime import datetime, timedelta
+import pytest
+
+from app import create_app, db
+from app.jobs import (cancel_job,
+                      claim_next_job,
+                      get_job_runner,
+                      ORPHANED,
+                      run_job,
+                      submit_job)
+from app.models import Employee, Job
+
+TOKEN = {'X-Admin-Token': 'secret'}
+
+
+@pytest.fixture
+def admin_app(app, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setitem(app.config, 'JOB_AUTOSTART', False)
+    monkeypatch.setitem(app.config, 'JOB_EXPORT_FOLDER', str(tmp_path))
+    return app
+
+def write_csv(tmp_path, rows):
+    csv_file = tmp_path / 'load.csv'
+    csv_file.write_text('fname,lname,dept,ext,email\n'
+                        + ''.join(f'Emp{n},Load{n},IT,{1000 + n},\n' for n in range(rows)))
+    return str(csv_file)
+
+def test_import_job_runs_to_completion(app, tmp_path):
+    with app.app_context():
+        job = submit_job('import', {'csv_file': write_csv(tmp_path, 5),
+                                    'fields': ['fname', 'lname', 'dept', 'ext', 'email'],
+                                    'chunk_bytes': 40})
+        job = run_job(claim_next_job())
+        assert (job.status, job.rows_done, job.progress) == ('succeeded', 5, 1.0)
+        assert job.result['rows'] == 5
+        assert Employee.query.filter(Employee.lname.like('Load%')).count() == 5
+
+def test_export_job_writes_file(admin_app, tmp_path):
+    with admin_app.app_context():
+        job = submit_job('export', {'format': 'jsonl', 'depts': ['HR']})
+        job = run_job(claim_next_job())
+        assert job.status == 'succeeded'
+        assert job.result['rows'] == 1
+        job_id = job.id
+
+    response = admin_app.test_client().get(f'/admin/jobs/{job_id}/download/', headers=TOKEN)
+    assert response.status_code == 200
+    assert b'Flangeworm' in response.data
+
+def test_cancel_running_job_stops_at_next_report(app, tmp_path):
+    with app.app_context():
+        submit_job('import', {'csv_file': write_csv(tmp_path, 5),
+                              'fields': ['fname', 'lname', 'dept', 'ext', 'email']})
+        job = claim_next_job()
+        cancel_job(job)
+        assert job.cancel_requested
+
+        job = run_job(job)
+        assert job.status == 'cancelled'
+        assert Employee.query.filter(Employee.lname.like('Load%')).count() == 0
+
+def test_cancel_queued_job(app):
+    with app.app_context():
+        job = cancel_job(submit_job('export', {}))
+        assert job.status == 'cancelled'
+        assert claim_next_job() is None
+
+def test_sweep_finishes_orphaned_jobs(app, tmp_path):
+    with app.app_context():
+        orphaned, cancelled, alive = [submit_job('export', {}) for _ in range(3)]
+        for _ in range(3):
+            claim_next_job()
+        old = datetime.now() - timedelta(seconds=app.config['JOB_STALE_AFTER'] + 1)
+        orphaned.heartbeat_at = cancelled.heartbeat_at = old
+        db.session.commit()
+
+        cancel_job(cancelled)
+        assert cancelled.status == 'cancelled'
+        assert alive.status == 'running'
+        assert orphaned.status == 'failed'
+        assert orphaned.error == ORPHANED
+
+def test_runner_heartbeats_running_jobs(app):
+    with app.app_context():
+        job = submit_job('export', {})
+        claim_next_job()
+        job.heartbeat_at = datetime.now() - timedelta(seconds=30)
+        db.session.commit()
+        runner = get_job_runner(start=False)
+        runner.running.add(job.id)
+        try:
+            runner.heartbeat()
+        finally:
+            runner.running.discard(job.id)
+        db.session.refresh(job)
+        assert job.heartbeat_at > datetime.now() - timedelta(seconds=5)
+
+def test_failed_job_records_error(app, tmp_path):
+    with app.app_context():
+        submit_job('import', {'csv_file': str(tmp_path / 'missing.csv'), 'fields': ['fname']})
+        job = run_job(claim_next_job())
+        assert job.status == 'failed'
+        assert job.error
+
+def test_admin_endpoints_need_token(admin_app):
+    client = admin_app.test_client()
+    assert client.get('/admin/jobs/').status_code == 403
+    assert client.get('/admin/jobs/', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert client.get('/admin/jobs/', headers=TOKEN).status_code == 200
+
+def test_submit_and_poll_job(admin_app):
+    client = admin_app.test_client()
+    response = client.post('/admin/jobs/', json={'kind': 'export', 'params': {'format': 'csv'}},
+                           headers=TOKEN)
+    assert response.status_code == 202
+    status = client.get(response.headers['Location'], headers=TOKEN).get_json()
+    assert status['status'] == 'queued'
+
+    response = client.post(f"/admin/jobs/{status['id']}/cancel/", headers=TOKEN)
+    assert response.get_json()['status'] == 'cancelled'
+
+    response = client.post('/admin/jobs/', json={'kind': 'export', 'params': {'format': 'xml'}},
+                           headers=TOKEN)
+    assert response.status_code == 400
+
+def test_http_export_cannot_choose_output(admin_app, tmp_path):
+    client = admin_app.test_client()
+    response = client.post('/admin/jobs/', json={'kind': 'export', 'params': {
+        'format': 'csv', 'output': str(tmp_path / 'elsewhere.csv')}}, headers=TOKEN)
+    assert response.status_code == 400
+    with admin_app.app_context():
+        assert claim_next_job() is None
+
+def test_runner_limits_concurrency(tmp_path):
+    app = create_app(database_uri=f"sqlite:///{tmp_path / 'jobs.db'}")
+    app.config['JOB_EXPORT_FOLDER'] = str(tmp_path)
+    app.config['JOB_POLL_INTERVAL'] = 0.05
+    with app.app_context():
+        db.create_all()
+        db.session.add(Employee(fname='Ann', lname='Lee', dept='IT', ext='1111',
+                                email='ann_lee@abnor.com'))
+        db.session.commit()
+        job_ids = [submit_job('export', {'format': 'csv'}).id for _ in range(3)]
+        runner = get_job_runner()
+
+    deadline = time.monotonic() + 10
+    statuses = []
+    while time.monotonic() < deadline:
+        assert runner.active <= 1
+        with app.app_context():
+            statuses = [db.session.get(Job, job_id).status for job_id in job_ids]
+        if all(status == 'succeeded' for status in statuses):
+            break
+        time.sleep(0.02)
+    runner.stop()
+    assert statuses == ['succeeded'] * 3
+
+def test_first_request_starts_runner_for_queued_jobs(tmp_path):
+    app = create_app(database_uri=f"sqlite:///{tmp_path / 'jobs.db'}")
+    app.config['JOB_EXPORT_FOLDER'] = str(tmp_path)
+    app.config['JOB_POLL_INTERVAL'] = 0.05
+    with app.app_context():
+        db.create_all()
+        # Queued as by manage_db.py export --background
+        job_id = submit_job('export', {'format': 'csv'}).id
+    assert 'job_runner' not in app.extensions
+
+    app.test_client().get('/')
+    runner = app.extensions['job_runner']
+    deadline = time.monotonic() + 10
+    status = None
+    while time.monotonic() < deadline and status != 'succeeded':
+        time.sleep(0.02)
+        with app.app_context():
+            status = db.session.get(Job, job_id).status
+    runner.stop()
+    assert status == 'succeeded'
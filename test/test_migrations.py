@@ -0,0 +1,141 @@
+"""
+Program: Test_migrations.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for online employee schema migrations
+
+
+Revisions:
+
+"""
+
+
+import pytest
+import sqlalchemy as sa
+
+from app import create_app, db
+from app.jobs import claim_next_job, run_job, submit_job
+from app.migrations import (current_version,
+                            Migration,
+                            migrate,
+                            migration_status,
+                            MIGRATIONS,
+                            stamp)
+from app.models import Employee, SchemaVersion
+
+DOMAIN = Migration(5, 'email domain',
+                   columns=(('email_domain', sa.String(50), None),),
+                   indexes=(('ix_employee_email_domain', ('email_domain',)),),
+                   backfill=(('email_domain', "substr(email, instr(email, '@') + 1)"),))
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """App on a file database, so ALTER TABLE leaves the shared one alone."""
+    app = create_app(database_uri=f"sqlite:///{tmp_path / 'migrate.db'}")
+    app.config['MIGRATION_PAUSE'] = 0
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Employee(fname=f'Emp{n}', lname='Lee', dept='IT', ext='1111',
+                                     email=f'emp{n}@abnor.com') for n in range(5)])
+        db.session.commit()
+    return app
+
+def domains(app):
+    with app.app_context():
+        return db.session.scalars(sa.text('SELECT email_domain FROM employee ORDER BY id')).all()
+
+def index_names(app):
+    with app.app_context():
+        return {index['name'] for index in sa.inspect(db.engine).get_indexes('employee')}
+
+def test_stamp_marks_new_database_current(file_app):
+    with file_app.app_context():
+        assert current_version() == 0
+        stamp()
+        assert current_version() == MIGRATIONS[-1].version
+        assert migrate() == ([], 0)
+
+def test_migrate_adds_missing_indexes(file_app):
+    with file_app.app_context():
+        db.session.execute(sa.text('DROP INDEX ix_employee_lname_id'))
+        db.session.commit()
+    assert 'ix_employee_lname_id' not in index_names(file_app)
+
+    with file_app.app_context():
+        assert migrate()[0] == [2, 3, 4]
+        assert [status['status'] for status in migration_status()] == ['applied'] * 4
+    assert 'ix_employee_lname_id' in index_names(file_app)
+
+def test_migrate_database_from_before_versioning(file_app):
+    """employee without the listing indexes, no job or schema_version table."""
+    with file_app.app_context():
+        for statement in ('DROP INDEX ix_employee_lname_id', 'DROP INDEX ix_employee_dept_id',
+                          'DROP TABLE job', 'DROP TABLE schema_version'):
+            db.session.execute(sa.text(statement))
+        db.session.commit()
+        assert (current_version(), migration_status()[0]['status']) == (0, 'pending')
+
+        assert migrate() == ([2, 3, 4], 0)
+        assert current_version() == 4
+        assert db.session.get(SchemaVersion, 1).status == 'applied'
+    assert {'ix_employee_lname_id', 'ix_employee_dept_id'} <= index_names(file_app)
+
+def test_migrate_adds_job_heartbeat(file_app):
+    with file_app.app_context():
+        stamp(MIGRATIONS[:2])
+        db.session.execute(sa.text('ALTER TABLE job DROP COLUMN heartbeat_at'))
+        db.session.commit()
+        assert migrate() == ([3, 4], 0)
+        columns = {column['name'] for column in sa.inspect(db.engine).get_columns('job')}
+    assert 'heartbeat_at' in columns
+
+def test_migrate_adds_shard_change_columns(file_app):
+    with file_app.app_context():
+        stamp(MIGRATIONS[:3])
+        for statement in ('DROP INDEX ix_employee_change_shard_seq',
+                          'ALTER TABLE employee_change DROP COLUMN shard',
+                          'ALTER TABLE employee_change DROP COLUMN shard_seq'):
+            db.session.execute(sa.text(statement))
+        db.session.commit()
+        assert migrate() == ([4], 0)
+        inspector = sa.inspect(db.engine)
+        columns = {column['name'] for column in inspector.get_columns('employee_change')}
+        indexes = {index['name']: index['unique'] for index in inspector.get_indexes('employee_change')}
+    assert {'shard', 'shard_seq'} <= columns
+    assert indexes['ix_employee_change_shard_seq']
+
+def test_backfill_in_batches_with_progress(file_app):
+    reports = []
+    with file_app.app_context():
+        stamp()
+        applied, rows = migrate(batch_size=2, progress=lambda rows, fraction:
+                                reports.append((rows, fraction)),
+                                migrations=MIGRATIONS + (DOMAIN,))
+        record = db.session.get(SchemaVersion, 5)
+        assert (applied, rows) == ([5], 5)
+        assert (record.status, record.rows_backfilled, record.backfill_keys) == \
+            ('applied', 5, {'main': 5})
+
+    assert reports == [(0, 0.0), (2, 0.4), (4, 0.8), (5, 1.0)]
+    assert domains(file_app) == ['abnor.com'] * 5
+    assert 'ix_employee_email_domain' in index_names(file_app)
+
+def test_interrupted_backfill_resumes_after_last_batch(file_app):
+    with file_app.app_context():
+        stamp()
+        db.session.add(SchemaVersion(version=5, name=DOMAIN.name, status='running',
+                                     backfill_keys={'main': 2}))
+        db.session.commit()
+        assert migrate(migrations=MIGRATIONS + (DOMAIN,)) == ([5], 3)
+
+    assert domains(file_app) == [None, None] + ['abnor.com'] * 3
+
+def test_migrate_job(file_app):
+    with file_app.app_context():
+        job = submit_job('migrate', {'batch_size': 2})
+        job = run_job(claim_next_job())
+        assert job.status == 'succeeded'
+        assert job.result['applied'] == [2, 3, 4]
+        assert current_version() == 4
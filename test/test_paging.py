@@ -0,0 +1,53 @@
+"""
+Program: Test_paging.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for listing page sizes and streamed pages
+
+
+Revisions:
+
+"""
+
+
+import pytest
+from bs4 import BeautifulSoup
+
+
+@pytest.fixture
+def stream_from_two(app):
+    """Stream any page of two or more rows."""
+    app.config['STREAM_PAGE_SIZE'] = 2
+    yield app
+    app.config['STREAM_PAGE_SIZE'] = 200
+
+def first_names(response):
+    soup = BeautifulSoup(response.data, 'html.parser')
+    return [row.find('td').string for row in soup.find('tbody').find_all('tr')]
+
+def test_per_page_parameter(client):
+    response = client.get('/?per_page=2')
+    assert first_names(response) == ['Gil', 'Wil']
+
+    soup = BeautifulSoup(response.data, 'html.parser')
+    pagination = soup.find('div', class_='pagination')
+    assert 'Page 1 of 2' in pagination.get_text()
+    assert pagination.find('a')['href'] == '/index/?page=2&per_page=2'
+
+def test_per_page_is_capped(client, app):
+    app.config['MAX_PAGE_SIZE'] = 2
+    try:
+        response = client.get('/?per_page=100')
+    finally:
+        app.config['MAX_PAGE_SIZE'] = 5000
+    assert first_names(response) == ['Gil', 'Wil']
+
+def test_large_pages_are_streamed(client, stream_from_two):
+    response = client.get('/?per_page=3', buffered=False)
+    assert response.is_streamed
+    assert first_names(response) == ['Gil', 'Wil', 'Maya']
+
+def test_streamed_page_past_end(client, stream_from_two):
+    response = client.get('/?per_page=3&page=5')
+    assert b'No employee data available.' in response.data
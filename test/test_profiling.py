@@ -0,0 +1,88 @@
+"""
+Program: Test_profiling.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for on-demand request profiling
+
+
+Revisions:
+
+"""
+
+
+import io
+import sys
+import zipfile
+import pytest
+
+from app.profiling import ProfileStore, RequestProfile
+
+ADMIN = {'X-Admin-Token': 'secret'}
+PROFILE = {'X-Admin-Token': 'secret', 'X-Profile': '1'}
+
+
+@pytest.fixture
+def admin_app(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', 'secret')
+    return app
+
+def test_profile_needs_admin_header(admin_app, client):
+    assert 'X-Profile-Id' not in client.get('/', headers={'X-Profile': '1'}).headers
+    assert 'X-Profile-Id' not in client.get('/').headers
+    assert 'X-Profile-Id' in client.get('/', headers=PROFILE).headers
+
+def test_profile_records_sql(admin_app, client):
+    profile_id = client.get('/?per_page=2', headers=PROFILE).headers['X-Profile-Id']
+
+    listed = client.get('/admin/profiles/', headers=ADMIN).get_json()['profiles']
+    assert int(profile_id) in [profile['id'] for profile in listed]
+
+    profile = client.get(f'/admin/profiles/{profile_id}/', headers=ADMIN).get_json()
+    assert profile['endpoint'] == 'pages.index'
+    assert profile['status'] == 200
+    assert any('FROM employee' in query['statement'] for query in profile['sql'])
+
+def test_streamed_page_profiled_to_the_end(admin_app, client):
+    response = client.get('/?per_page=500', headers=PROFILE)
+    assert b'Manglefrog' in response.data
+    profile_id = response.headers['X-Profile-Id']
+    profile = client.get(f'/admin/profiles/{profile_id}/', headers=ADMIN).get_json()
+    assert any('LIMIT' in query['statement'] for query in profile['sql'])
+
+def test_sample_rate_profiles_writes(admin_app, client, monkeypatch):
+    monkeypatch.setitem(admin_app.config, 'PROFILE_SAMPLE_RATE', 1.0)
+    response = client.post('/update_emp/2/', data={'fname': 'Gil', 'lname': 'Flangeworm',
+                                                   'dept': 'HR', 'ext': '4321'})
+    assert 'X-Profile-Id' in response.headers
+
+def test_folded_stacks_and_zip(admin_app, client):
+    with admin_app.test_request_context():
+        profile = RequestProfile('GET', '/', 'pages.index')
+    profile.add_sample(sys._getframe())
+    profile.add_sample(sys._getframe())
+    profile.query_started('SELECT 1')
+    profile.add_sample(sys._getframe())
+    profile.query_finished('SELECT 1', False)
+    profile.finish()
+
+    lines = profile.folded().splitlines()
+    assert lines[0].endswith(' 2')
+    assert 'test_folded_stacks_and_zip (test/test_profiling.py:' in lines[0]
+    assert lines[1].split(';')[-1] == 'sql: SELECT 1 1'
+
+    admin_app.extensions['profile_store'].add(profile)
+    response = client.get(f'/admin/profiles/{profile.id}/flamegraph/?format=zip', headers=ADMIN)
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    name = f'profile-{profile.id}'
+    assert archive.read(f'{name}.folded').decode() == profile.folded()
+    assert 'SELECT 1;' in archive.read(f'{name}.sql').decode()
+
+def test_store_keeps_slowest(admin_app):
+    store = ProfileStore(keep=2)
+    with admin_app.test_request_context():
+        for duration in (0.3, 0.1, 0.2):
+            profile = RequestProfile('GET', '/', 'pages.index')
+            profile.duration = duration
+            store.add(profile)
+    assert [profile.duration for profile in store.slowest()] == [0.3, 0.2]
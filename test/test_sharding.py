@@ -0,0 +1,244 @@
+"""
+Program: Test_sharding.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for department-sharded storage
+
+
+Revisions:
+
+"""
+
+
+import json
+import sqlite3
+import pytest
+import sqlalchemy as sa
+
+from app import create_app, db
+from app import sharding
+from app.changes import OP_INSERT, record_change
+from app.exporter import iter_batches
+from app.importer import import_csv
+from app.models import Employee, EmployeeChange, EmployeeLocator
+from app.queries import count_employees, listing_page
+from app.validation import department
+
+OFFICE, PLANT = sharding.ID_RANGE, 2 * sharding.ID_RANGE
+
+
+@pytest.fixture
+def sharded_app(tmp_path):
+    """Two shards: HR and IT in one, ENG, MAN and SAL in the other."""
+    office = f"sqlite:///{tmp_path / 'office.db'}"
+    plant = f"sqlite:///{tmp_path / 'plant.db'}"
+    app = create_app(database_uri=f"sqlite:///{tmp_path / 'main.db'}",
+                     shard_uris={'HR': office, 'IT': office,
+                                 'ENG': plant, 'MAN': plant, 'SAL': plant})
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+        sharding.create_all()
+        for fname, lname, dept in [('Maya', 'Name', 'IT'), ('Gil', 'Flangeworm', 'HR'),
+                                   ('Wil', 'Manglefrog', 'SAL'), ('Ann', 'Lee', 'ENG')]:
+            emp = sharding.add_employee(Employee(fname=fname, lname=lname, dept=dept, ext='1234',
+                                                 email=f'{fname.lower()}_{lname.lower()}@abnor.com'))
+            record_change(OP_INSERT, emp)
+        db.session.commit()
+    yield app
+    for engine in app.extensions['shard_engines'].values():
+        engine.dispose()
+
+def shard_rows(app, key):
+    with app.app_context(), sharding.shard_engine(key).connect() as conn:
+        return conn.execute(sa.text('SELECT id, lname FROM employee ORDER BY id')).all()
+
+def test_shard_binds_share_uris():
+    uris, departments = sharding.shard_binds({'ENG': 'sqlite:///b.db', 'HR': 'sqlite:///a.db',
+                                               'IT': 'sqlite:///a.db', 'MAN': 'sqlite:///b.db',
+                                               'SAL': 'sqlite:///b.db'})
+    assert uris == {'shard_1': 'sqlite:///b.db', 'shard_2': 'sqlite:///a.db'}
+    assert departments == {'ENG': 'shard_1', 'HR': 'shard_2', 'IT': 'shard_2',
+                           'MAN': 'shard_1', 'SAL': 'shard_1'}
+
+def test_incomplete_shard_map_rejected():
+    with pytest.raises(ValueError, match='ENG, MAN'):
+        create_app(database_uri='sqlite://', shard_uris={'HR': 'sqlite:///a.db',
+                                                         'IT': 'sqlite:///a.db',
+                                                         'SAL': 'sqlite:///b.db'})
+
+def test_rows_stored_in_department_shard(sharded_app):
+    assert shard_rows(sharded_app, 'shard_1') == [(OFFICE + 1, 'Name'), (OFFICE + 2, 'Flangeworm')]
+    assert shard_rows(sharded_app, 'shard_2') == [(PLANT + 1, 'Manglefrog'), (PLANT + 2, 'Lee')]
+    with sharded_app.app_context():
+        assert db.session.scalar(sa.select(sa.func.count()).select_from(Employee)) == 0
+        assert count_employees() == 4
+
+def test_listing_merges_shards_in_order(sharded_app):
+    with sharded_app.app_context():
+        first, total_pages = listing_page(1, 3)
+        second, _ = listing_page(2, 3)
+    assert total_pages == 2
+    assert [row.lname for row in first + second] == ['Flangeworm', 'Lee', 'Manglefrog', 'Name']
+
+def test_index_page_lists_all_shards(sharded_app):
+    response = sharded_app.test_client().get('/?per_page=10')
+    for name in (b'Flangeworm', b'Lee', b'Manglefrog', b'Name'):
+        assert name in response.data
+
+def test_update_moves_employee_between_shards(sharded_app):
+    client = sharded_app.test_client()
+    response = client.post(f'/update_emp/{OFFICE + 2}/', data={'fname': 'Gil', 'lname': 'Flangeworm',
+                                                   'dept': 'MAN', 'ext': '4321'},
+                           follow_redirects=True)
+    assert b'Gil Flangeworm updated in database' in response.data
+    assert OFFICE + 2 not in [emp_id for emp_id, _ in shard_rows(sharded_app, 'shard_1')]
+    assert OFFICE + 2 in [emp_id for emp_id, _ in shard_rows(sharded_app, 'shard_2')]
+    with sharded_app.app_context():
+        assert db.session.get(EmployeeLocator, OFFICE + 2).shard == 'shard_2'
+        assert sharding.get_employee(OFFICE + 2).ext == '4321'
+
+def test_delete_removes_row_and_locator(sharded_app):
+    client = sharded_app.test_client()
+    client.post(f'/delete_emp/{PLANT + 1}/', follow_redirects=True)
+    assert shard_rows(sharded_app, 'shard_2') == [(PLANT + 2, 'Lee')]
+    with sharded_app.app_context():
+        assert db.session.get(EmployeeLocator, PLANT + 1) is None
+
+def test_main_database_not_locked_during_shard_write(sharded_app, tmp_path):
+    with sharded_app.app_context():
+        emp = sharding.add_employee(Employee(fname='Bob', lname='Stone', dept='ENG',
+                                             ext='3998', email='bob_stone@abnor.com'))
+        record_change(OP_INSERT, emp)
+        # Another writer can still take the main database's write lock
+        other = sqlite3.connect(tmp_path / 'main.db', timeout=0)
+        other.execute('BEGIN IMMEDIATE')
+        other.rollback()
+        other.close()
+        db.session.commit()
+        change = db.session.scalars(sa.select(EmployeeChange)
+                                    .order_by(EmployeeChange.seq.desc()).limit(1)).one()
+        assert (change.emp_id, change.shard, change.shard_seq) == (emp.id, 'shard_2', 3)
+        assert db.session.get(EmployeeLocator, emp.id).email == 'bob_stone@abnor.com'
+
+def test_rollback_discards_shard_write(sharded_app):
+    with sharded_app.app_context():
+        emp = sharding.add_employee(Employee(fname='Bob', lname='Stone', dept='ENG',
+                                             ext='3998', email='bob_stone@abnor.com'))
+        record_change(OP_INSERT, emp)
+        db.session.rollback()
+        assert db.session.get(EmployeeLocator, emp.id) is None
+        assert db.session.scalar(sa.select(sa.func.count()).select_from(EmployeeChange)) == 4
+    assert [lname for _, lname in shard_rows(sharded_app, 'shard_2')] == ['Manglefrog', 'Lee']
+
+def test_email_claimed_meanwhile_undoes_insert(sharded_app):
+    with sharded_app.app_context():
+        emp = sharding.add_employee(Employee(fname='Bob', lname='Stone', dept='ENG',
+                                             ext='3998', email='bob_stone@abnor.com'))
+        record_change(OP_INSERT, emp)
+        # Another writer claims the email before this one commits
+        with db.engine.begin() as connection:
+            connection.execute(sa.insert(EmployeeLocator).values(
+                id=OFFICE + 9, email='bob_stone@abnor.com', shard='shard_1'))
+        with pytest.raises(sa.exc.IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+    assert [lname for _, lname in shard_rows(sharded_app, 'shard_2')] == ['Manglefrog', 'Lee']
+    with sharded_app.app_context(), sharding.shard_engine('shard_2').connect() as conn:
+        assert conn.execute(sa.text('SELECT count(*) FROM employee_change')).scalar() == 2
+
+def test_sync_copies_changes_left_in_shard(sharded_app):
+    with sharded_app.app_context():
+        emp = sharding.add_employee(Employee(fname='Bob', lname='Stone', dept='ENG',
+                                             ext='3998', email='bob_stone@abnor.com'))
+        record_change(OP_INSERT, emp)
+        # The process stops after the shard commit
+        sharding.shard_session('shard_2').commit()
+        db.session.rollback()
+        assert sharding.get_employee(emp.id) is None
+
+        assert sharding.sync_changes() == 0
+        sharded_app.config['SHARD_SYNC_AFTER'] = 0
+        assert sharding.sync_changes() == 1
+        assert sharding.sync_changes() == 0
+        assert sharding.get_employee(emp.id).lname == 'Stone'
+        change = db.session.scalars(sa.select(EmployeeChange)
+                                    .order_by(EmployeeChange.seq.desc()).limit(1)).one()
+        assert (change.emp_id, change.op, change.shard_seq) == (emp.id, OP_INSERT, 3)
+
+def test_ids_from_shard_range_in_one_transaction(sharded_app, monkeypatch):
+    monkeypatch.setattr(sharding, 'ID_BLOCK', 2)
+    with sharded_app.app_context():
+        sharded_app.extensions['shard_id_blocks'].clear()
+        for n in range(3):
+            emp = sharding.add_employee(Employee(fname='Bob', lname=f'Stone{n}', dept='ENG',
+                                                 ext='3998', email=f'bob_stone{n}@abnor.com'))
+            record_change(OP_INSERT, emp)
+        db.session.commit()
+    assert [emp_id for emp_id, _ in shard_rows(sharded_app, 'shard_2')][2:] == \
+        [PLANT + 101, PLANT + 102, PLANT + 103]
+
+def test_email_variants_span_shards(sharded_app):
+    client = sharded_app.test_client()
+    client.post('/add_emp/', data={'fname': 'Ann', 'lname': 'Lee', 'dept': 'HR', 'ext': '5555'},
+                follow_redirects=True)
+    with sharded_app.app_context():
+        emp = sharding.get_employee(OFFICE + 3)
+        assert (emp.dept, emp.email) == ('HR', 'ann_lee_2@abnor.com')
+
+def test_api_lookup_fans_out(sharded_app):
+    client = sharded_app.test_client()
+    assert client.get(f'/api/employees/{PLANT + 1}/').get_json()['lname'] == 'Manglefrog'
+    found = client.get('/api/employees/?ext=1234').get_json()['employees']
+    assert [emp['id'] for emp in found] == [OFFICE + 1, OFFICE + 2, PLANT + 1, PLANT + 2]
+
+def test_export_reads_owning_shards_in_id_order(sharded_app):
+    with sharded_app.app_context():
+        everyone = [row.id for batch in iter_batches(batch_size=3) for row in batch]
+        plant = [row.dept for batch in iter_batches(['SAL'], batch_size=3) for row in batch]
+    assert everyone == [OFFICE + 1, OFFICE + 2, PLANT + 1, PLANT + 2]
+    assert plant == ['SAL']
+
+def test_import_routes_rows_to_shards(sharded_app, tmp_path):
+    csv_file = tmp_path / 'load.csv'
+    csv_file.write_text('fname,lname,dept,ext,email\n'
+                        'Megan,Wolfgrill,IT,3999,\n'
+                        'Bob,Stone,ENG,3998,\n')
+    with sharded_app.app_context():
+        result = import_csv(str(csv_file), Employee, ['fname', 'lname', 'dept', 'ext', 'email'])
+    assert result.rows == 2
+    assert shard_rows(sharded_app, 'shard_1')[-1] == (OFFICE + 3, 'Wolfgrill')
+    assert shard_rows(sharded_app, 'shard_2')[-1] == (PLANT + 3, 'Stone')
+    with sharded_app.app_context():
+        assert db.session.get(EmployeeLocator, PLANT + 3).shard == 'shard_2'
+
+def test_shard_uris_from_environment(tmp_path, monkeypatch):
+    uri = f"sqlite:///{tmp_path / 'all.db'}"
+    monkeypatch.setenv('SHARD_URIS', json.dumps({code: uri for code, _ in department}))
+    app = create_app(database_uri='sqlite://')
+    assert app.config['DEPARTMENT_SHARDS'] == {code: 'shard_1' for code, _ in department}
+
+def test_move_existing_rows_to_shards(tmp_path):
+    main = f"sqlite:///{tmp_path / 'main.db'}"
+    app = create_app(database_uri=main)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Employee(fname=f'Emp{n}', lname='Lee', dept=dept, ext='1111',
+                                     email=f'emp{n}@abnor.com')
+                            for n, dept in enumerate(['IT', 'SAL', 'HR'])])
+        db.session.commit()
+
+    office = f"sqlite:///{tmp_path / 'office.db'}"
+    plant = f"sqlite:///{tmp_path / 'plant.db'}"
+    app = create_app(database_uri=main, shard_uris={'HR': office, 'IT': office,
+                                                    'ENG': plant, 'MAN': plant, 'SAL': plant})
+    with app.app_context():
+        sharding.create_all()
+        assert sharding.move_to_shards(batch_size=2) == 3
+        assert db.session.scalar(sa.select(sa.func.count()).select_from(Employee)) == 0
+        assert count_employees() == 3
+        assert sharding.get_employee(2).dept == 'SAL'
+    assert shard_rows(app, 'shard_1') == [(1, 'Lee'), (3, 'Lee')]
+    for engine in app.extensions['shard_engines'].values():
+        engine.dispose()
@@ -0,0 +1,79 @@
+"""
+Program: Test_validation.py
+Author: Maya Name
+Creation Date: 10/19/2026
+Revision Date:
+Description: Unit tests for the shared employee validation rules
+
+
+Revisions:
+
+"""
+
+
+from app.importer import import_csv
+from app.models import Employee
+from app.validation import BatchValidator, validate_records
+
+
+def test_batch_validator_reports_per_row_errors():
+    validate = BatchValidator(['fname', 'lname', 'dept', 'ext', 'email'])
+    rows = [('Maya', 'Name', 'IT', '3234', 'maya_name@adnor.com'),
+            ('', 'Name', 'Sales', '12a4', ''),
+            ('Gil', 'Flangeworm', 'HR', '123', '')]
+
+    assert validate(rows) == {
+        1: ['fname: This field is required.',
+            'dept: Not a valid choice.',
+            'ext: Only numeric characters are allowed.'],
+        2: ['ext: Extension must be between 4 numbers long'],
+    }
+
+def test_validate_records_requires_every_field():
+    rows, errors = validate_records([{'fname': 'Maya', 'lname': 'Name', 'dept': 'IT', 'ext': 3234},
+                                     {'fname': 'Gil'}])
+
+    assert rows[0] == ('Maya', 'Name', 'IT', '3234')
+    assert list(errors) == [1]
+    assert 'dept: This field is required.' in errors[1]
+
+def test_form_uses_shared_rules(client):
+    response = client.post('/add_emp/', data={'fname': 'Megan', 'lname': 'Wolfgrill',
+                                              'dept': 'IT', 'ext': '39a9'})
+    assert b'Only numeric characters are allowed.' in response.data
+
+    response = client.post('/add_emp/', data={'fname': 'Megan', 'lname': 'Wolfgrill',
+                                              'dept': 'IT', 'ext': '399'})
+    assert b'Extension must be between 4 numbers long' in response.data
+
+def test_form_invalid_dept_reported_once(client):
+    response = client.post('/add_emp/', data={'fname': 'Megan', 'lname': 'Wolfgrill',
+                                              'dept': 'XX', 'ext': '3999'})
+    assert response.data.count(b'Not a valid choice.') == 1
+
+def test_import_skips_invalid_rows(app, tmp_path):
+    csv_file = tmp_path / 'load.csv'
+    csv_file.write_text('fname,lname,dept,ext,email\n'
+                        'Megan,Wolfgrill,IT,3999,megan_wolfgrill@abnor.com\n'
+                        'Agnew,Flomgrill,!T,3956,agnew_flomgrill@abnor.com\n')
+
+    with app.app_context():
+        result = import_csv(str(csv_file), Employee, ['fname', 'lname', 'dept', 'ext', 'email'])
+        assert Employee.query.filter_by(lname='Flomgrill').first() is None
+        assert Employee.query.filter_by(lname='Wolfgrill').first() is not None
+
+    assert result.rows == 2
+    assert result.rejected == 1
+    assert result.errors == ((2, ['dept: Not a valid choice.']),)
+
+def test_bulk_endpoint(client):
+    response = client.post('/api/employees/bulk/', json=[
+        {'fname': 'Megan', 'lname': 'Wolfgrill', 'dept': 'IT', 'ext': '3999'},
+        {'fname': 'Agnew', 'lname': 'Flomgrill', 'dept': 'IT', 'ext': 'abcd'},
+    ])
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [emp['email'] for emp in body['created']] == ['megan_wolfgrill@abnor.com']
+    assert body['errors'] == [{'row': 1, 'errors': ['ext: Only numeric characters are allowed.']}]
+    assert client.post('/api/employees/bulk/', json={'fname': 'Megan'}).status_code == 400